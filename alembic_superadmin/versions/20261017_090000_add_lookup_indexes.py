@@ -0,0 +1,45 @@
+"""add case-insensitive lookup indexes to tenants
+
+Revision ID: 20261017_090000
+Revises: 20260106_224500
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017_090000'
+down_revision = '20260106_224500'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Add partial functional indexes on lower(company_name) and lower(admin_email).
+    
+    Tenant resolution filters on lower(...) = :key AND status = 'active',
+    which the plain btree indexes on company_name/admin_email cannot serve.
+    """
+    op.create_index(
+        'ix_tenants_company_name_lower_active',
+        'tenants',
+        [sa.text('lower(company_name)')],
+        unique=False,
+        postgresql_where=sa.text("status = 'active'")
+    )
+    op.create_index(
+        'ix_tenants_admin_email_lower_active',
+        'tenants',
+        [sa.text('lower(admin_email)')],
+        unique=False,
+        postgresql_where=sa.text("status = 'active'")
+    )
+
+
+def downgrade() -> None:
+    """Drop the lookup indexes."""
+    op.drop_index('ix_tenants_admin_email_lower_active', table_name='tenants')
+    op.drop_index('ix_tenants_company_name_lower_active', table_name='tenants')
@@ -0,0 +1,33 @@
+"""add updated_at and version to tenants
+
+Revision ID: 20261017_100000
+Revises: 20261017_090000
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017_100000'
+down_revision = '20261017_090000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Add updated_at and a row version counter to tenants.
+    
+    The version is bumped by the ORM on every update and is used to build
+    ETags for the tenant lookup endpoints.
+    """
+    op.add_column('tenants', sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False))
+    op.add_column('tenants', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Remove updated_at and version columns."""
+    op.drop_column('tenants', 'version')
+    op.drop_column('tenants', 'updated_at')
@@ -0,0 +1,45 @@
+"""add tenant_events table
+
+Revision ID: 20261017_110000
+Revises: 20261017_100000
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017_110000'
+down_revision = '20261017_100000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Create tenant_events, the append-only tenant change log.
+    
+    Every tenant create/status change/delete and tenant user registration
+    is written here and published with NOTIFY; the id is the sequence
+    number subscribers resume from.
+    """
+    op.create_table(
+        'tenant_events',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('event_type', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('company_name', sa.String(), nullable=True),
+        sa.Column('admin_email', sa.String(), nullable=True),
+        sa.Column('user_email', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_tenant_events_tenant_id'), 'tenant_events', ['tenant_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop tenant_events table."""
+    op.drop_index(op.f('ix_tenant_events_tenant_id'), table_name='tenant_events')
+    op.drop_table('tenant_events')
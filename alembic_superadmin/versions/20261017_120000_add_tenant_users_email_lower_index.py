@@ -0,0 +1,36 @@
+"""add case-insensitive email index to tenant_users
+
+Revision ID: 20261017_120000
+Revises: 20261017_110000
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017_120000'
+down_revision = '20261017_110000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Add a functional index on lower(email) to tenant_users.
+    
+    Email resolution matches admin emails and registered user emails
+    case-insensitively in one query; this serves the tenant_users side.
+    """
+    op.create_index(
+        'ix_tenant_users_email_lower',
+        'tenant_users',
+        [sa.text('lower(email)')],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Drop the lower(email) index."""
+    op.drop_index('ix_tenant_users_email_lower', table_name='tenant_users')
@@ -0,0 +1,55 @@
+"""add provisioning_jobs table
+
+Revision ID: 20261017_130000
+Revises: 20261017_120000
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017_130000'
+down_revision = '20261017_120000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Create provisioning_jobs, the state of background tenant provisioning.
+    
+    Rows are written by the job queue and polled through
+    GET /super-admin/jobs/{id}. The initial admin password is only stored
+    encrypted; worker_id and heartbeat_at identify the process running a
+    job, so jobs of a process that died can be failed.
+    """
+    op.create_table(
+        'provisioning_jobs',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('job_type', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('params', sa.JSON(), nullable=False),
+        sa.Column('steps', sa.JSON(), nullable=True),
+        sa.Column('tenant_id', sa.Integer(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('worker_id', sa.String(), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('initial_password_encrypted', sa.Text(), nullable=True),
+        sa.Column('password_collected_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_provisioning_jobs_status'), 'provisioning_jobs', ['status'], unique=False)
+    op.create_index(op.f('ix_provisioning_jobs_tenant_id'), 'provisioning_jobs', ['tenant_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop provisioning_jobs table."""
+    op.drop_index(op.f('ix_provisioning_jobs_tenant_id'), table_name='provisioning_jobs')
+    op.drop_index(op.f('ix_provisioning_jobs_status'), table_name='provisioning_jobs')
+    op.drop_table('provisioning_jobs')
@@ -0,0 +1,30 @@
+"""add provisioning_timings to tenants
+
+Revision ID: 20261017_140000
+Revises: 20261017_130000
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017_140000'
+down_revision = '20261017_130000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Add provisioning_timings to tenants.
+    
+    Holds the per-step duration breakdown of the tenant's provisioning run.
+    """
+    op.add_column('tenants', sa.Column('provisioning_timings', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove provisioning_timings column."""
+    op.drop_column('tenants', 'provisioning_timings')
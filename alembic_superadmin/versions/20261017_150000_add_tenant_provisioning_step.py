@@ -0,0 +1,32 @@
+"""add provisioning_step to tenants
+
+Revision ID: 20261017_150000
+Revises: 20261017_140000
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017_150000'
+down_revision = '20261017_140000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Add provisioning_step to tenants.
+    
+    Records the provisioning step that is running or failed, so a failed
+    provisioning can be resumed from that step. NULL once provisioning
+    completed.
+    """
+    op.add_column('tenants', sa.Column('provisioning_step', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove provisioning_step column."""
+    op.drop_column('tenants', 'provisioning_step')
@@ -0,0 +1,34 @@
+"""add schema_revision to tenants
+
+Revision ID: 20261017_160000
+Revises: 20261017_150000
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017_160000'
+down_revision = '20261017_150000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Add schema_revision and schema_checked_at to tenants.
+    
+    The fleet migration records the tenant_migrations revision found in
+    each tenant database, so out-of-date tenants can be listed without
+    connecting to every database.
+    """
+    op.add_column('tenants', sa.Column('schema_revision', sa.String(), nullable=True))
+    op.add_column('tenants', sa.Column('schema_checked_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove schema_revision and schema_checked_at columns."""
+    op.drop_column('tenants', 'schema_checked_at')
+    op.drop_column('tenants', 'schema_revision')
@@ -0,0 +1,37 @@
+"""Helpers for running blocking work from async request handlers."""
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import asyncio
+
+from app.config import settings
+
+
+# Dedicated pool for blocking calls that have no async driver: CREATE DATABASE
+# through server_engine, tenant schema DDL and tenant seeding
+# (bcrypt runs on the process pool in app.hashing).
+# Kept separate from the default executor so provisioning cannot starve
+# other users of asyncio.to_thread().
+blocking_executor = ThreadPoolExecutor(
+    max_workers=settings.BLOCKING_EXECUTOR_WORKERS,
+    thread_name_prefix="blocking"
+)
+
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Run a blocking function in the blocking executor and await its result.
+    
+    Args:
+        func: Callable to run
+        *args, **kwargs: Arguments passed to func
+        
+    Returns:
+        Whatever func returns (exceptions are re-raised in the caller)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(blocking_executor, partial(func, *args, **kwargs))
+
+
+def shutdown_blocking_executor() -> None:
+    """Stop accepting new blocking work and wait for running calls to finish."""
+    blocking_executor.shutdown(wait=True)
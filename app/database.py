@@ -1,33 +1,220 @@
 """Database configuration and session management."""
-from sqlalchemy import create_engine
+from collections import OrderedDict
+from threading import Lock
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, Session
 from app.config import settings
+from app.pooling import pool_options, register_engine
 from app.superadmin.models import SuperAdminBase
 # Import all models so they're registered with SuperAdminBase.metadata
 from app.superadmin.models import Tenant  # noqa: F401
 from app.superadmin.tenant_users_model import TenantUser  # noqa: F401
+from app.superadmin.tenant_events_model import TenantEvent  # noqa: F401
+from app.superadmin.provisioning_jobs_model import ProvisioningJob  # noqa: F401
+import time
 
 
 # Engine for super_admin_db (for tenant metadata storage)
 super_admin_engine = create_engine(
     settings.POSTGRES_SUPER_ADMIN_URL,
-    pool_pre_ping=True,
-    echo=False
+    echo=False,
+    **pool_options("super_admin")
 )
+register_engine("super_admin", super_admin_engine)
 
 # Engine for PostgreSQL server (for CREATE DATABASE operations)
 # Use AUTOCOMMIT isolation level to allow DDL operations
 server_engine = create_engine(
     settings.POSTGRES_SERVER_URL,
     isolation_level="AUTOCOMMIT",
-    pool_pre_ping=True,
-    echo=False
+    echo=False,
+    **pool_options("server")
 )
+register_engine("server", server_engine)
 
 # Session factory for super_admin_db
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=super_admin_engine)
 
 
+def to_async_url(url: str) -> str:
+    """Convert a sync PostgreSQL URL (e.g. postgresql+psycopg2://) to the asyncpg driver."""
+    return make_url(url).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+# Async engine for super_admin_db, used by the API request handlers so that
+# queries do not block the event loop. The sync engine above is still used
+# by init_db, scripts and provisioning code running in the blocking executor.
+super_admin_async_engine = create_async_engine(
+    settings.POSTGRES_SUPER_ADMIN_ASYNC_URL or to_async_url(settings.POSTGRES_SUPER_ADMIN_URL),
+    echo=False,
+    **pool_options("super_admin_async", is_async=True)
+)
+register_engine("super_admin_async", super_admin_async_engine)
+
+class PrimarySession(Session):
+    """Sync session class behind AsyncSessionLocal; its commits start the read-after-write window."""
+
+
+# Async session factory for super_admin_db. Objects stay usable after commit,
+# since lazy attribute refreshes are not possible under asyncio.
+AsyncSessionLocal = async_sessionmaker(
+    bind=super_admin_async_engine,
+    sync_session_class=PrimarySession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Optional read-only replica of super_admin_db for lookups and listings
+super_admin_replica_engine = None
+ReplicaSessionLocal = None
+if settings.POSTGRES_SUPER_ADMIN_REPLICA_URL:
+    super_admin_replica_engine = create_async_engine(
+        to_async_url(settings.POSTGRES_SUPER_ADMIN_REPLICA_URL),
+        echo=False,
+        connect_args={"server_settings": {"default_transaction_read_only": "on"}},
+        **pool_options("super_admin_replica", is_async=True)
+    )
+    register_engine("super_admin_replica", super_admin_replica_engine)
+    ReplicaSessionLocal = async_sessionmaker(
+        bind=super_admin_replica_engine,
+        autoflush=False,
+        expire_on_commit=False
+    )
+
+# time.monotonic() of the last known tenant write (this worker or, via tenant events, another)
+_last_primary_write = 0.0
+
+
+def mark_primary_write() -> None:
+    """Route reads to the primary for REPLICA_READ_AFTER_WRITE_SECONDS from now."""
+    global _last_primary_write
+    _last_primary_write = time.monotonic()
+
+
+def replica_available() -> bool:
+    """Whether reads may go to the replica (configured, and no recent write)."""
+    return (
+        ReplicaSessionLocal is not None
+        and time.monotonic() - _last_primary_write >= settings.REPLICA_READ_AFTER_WRITE_SECONDS
+    )
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _remember_write(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _start_read_after_write_window(session):
+    if session.info.pop("wrote", False):
+        mark_primary_write()
+
+
+@event.listens_for(PrimarySession, "after_rollback")
+def _forget_write(session):
+    session.info.pop("wrote", None)
+
+
+def tenant_db_url(db_name: str) -> str:
+    """
+    Build the URL of a tenant database on the PostgreSQL server.
+    
+    Args:
+        db_name: Name of the tenant database
+        
+    Returns:
+        POSTGRES_SERVER_URL with the database name replaced
+    """
+    return make_url(settings.POSTGRES_SERVER_URL).set(database=db_name).render_as_string(hide_password=False)
+
+
+class TenantEngineRegistry:
+    """
+    Bounded registry of engines for tenant databases, keyed by db_name.
+    
+    Provisioning and fleet-wide maintenance (schema fixes, admin re-seeds)
+    reuse one small pool per tenant database instead of creating a new
+    engine on every call. The least recently used engine is disposed when
+    the registry is full.
+    """
+    
+    def __init__(self, max_size: int, pool_size: int, max_overflow: int):
+        self.max_size = max_size
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self._engines = OrderedDict()  # db_name -> Engine
+        self._lock = Lock()
+        self.created = 0
+        self.evicted = 0
+    
+    def get(self, db_name: str) -> Engine:
+        """Return the engine for db_name, creating it if needed."""
+        with self._lock:
+            engine = self._engines.get(db_name)
+            if engine is not None:
+                self._engines.move_to_end(db_name)
+                return engine
+            
+            engine = create_engine(
+                tenant_db_url(db_name),
+                pool_pre_ping=True,
+                pool_size=self.pool_size,
+                max_overflow=self.max_overflow
+            )
+            self._engines[db_name] = engine
+            self.created += 1
+            
+            evicted = []
+            while len(self._engines) > max(self.max_size, 1):
+                _, oldest = self._engines.popitem(last=False)
+                evicted.append(oldest)
+                self.evicted += 1
+        
+        for oldest in evicted:
+            oldest.dispose()
+        return engine
+    
+    def dispose(self, db_name: str) -> None:
+        """Dispose the engine of db_name (e.g. before the database is dropped)."""
+        with self._lock:
+            engine = self._engines.pop(db_name, None)
+        if engine is not None:
+            engine.dispose()
+    
+    def dispose_all(self) -> None:
+        """Dispose every engine (application shutdown)."""
+        with self._lock:
+            engines = list(self._engines.values())
+            self._engines.clear()
+        for engine in engines:
+            engine.dispose()
+    
+    def stats(self) -> dict:
+        """Return registry counters for monitoring."""
+        with self._lock:
+            return {
+                "size": len(self._engines),
+                "max_size": self.max_size,
+                "created": self.created,
+                "evicted": self.evicted
+            }
+
+
+# Shared registry of tenant database engines
+tenant_engines = TenantEngineRegistry(
+    max_size=settings.TENANT_ENGINE_CACHE_SIZE,
+    pool_size=settings.TENANT_ENGINE_POOL_SIZE,
+    max_overflow=settings.TENANT_ENGINE_MAX_OVERFLOW
+)
+
+
+def get_tenant_engine(db_name: str) -> Engine:
+    """Get the shared engine for a tenant database (see TenantEngineRegistry)."""
+    return tenant_engines.get(db_name)
+
+
 def init_db():
     """Initialize the super_admin_db by creating all tables."""
     from sqlalchemy import text, inspect
@@ -138,6 +325,54 @@ def init_db():
     except Exception as e:
         logger.error(f"❌ Failed to add company_name column: {str(e)}")
         raise  # Re-raise to prevent service from starting with broken schema
+    
+    # Idempotent schema upgrades mirroring the alembic_superadmin revisions.
+    # create_all() only creates missing tables, so existing ones are upgraded here.
+    try:
+        with super_admin_engine.begin() as connection:
+            # 20261017_090000: case-insensitive lookup indexes
+            connection.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_tenants_company_name_lower_active
+                ON tenants (lower(company_name)) WHERE status = 'active'
+            """))
+            connection.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_tenants_admin_email_lower_active
+                ON tenants (lower(admin_email)) WHERE status = 'active'
+            """))
+            
+            # 20261017_100000: row version for lookup ETags
+            connection.execute(text("""
+                ALTER TABLE tenants
+                ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP NOT NULL DEFAULT now(),
+                ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1
+            """))
+            
+            # 20261017_120000: case-insensitive tenant_users email lookups
+            connection.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_tenant_users_email_lower
+                ON tenant_users (lower(email))
+            """))
+            
+            # 20261017_140000: provisioning duration breakdown
+            connection.execute(text("""
+                ALTER TABLE tenants ADD COLUMN IF NOT EXISTS provisioning_timings JSON
+            """))
+            
+            # 20261017_150000: resumable provisioning
+            connection.execute(text("""
+                ALTER TABLE tenants ADD COLUMN IF NOT EXISTS provisioning_step VARCHAR
+            """))
+            
+            # 20261017_160000: tenant database schema revision
+            connection.execute(text("""
+                ALTER TABLE tenants
+                ADD COLUMN IF NOT EXISTS schema_revision VARCHAR,
+                ADD COLUMN IF NOT EXISTS schema_checked_at TIMESTAMP
+            """))
+        logger.info("✅ Tenant schema upgrades verified")
+    except Exception as e:
+        logger.error(f"❌ Failed to upgrade tenants schema: {str(e)}")
+        raise
 
 
 def get_super_admin_db() -> Session:
@@ -151,3 +386,24 @@ def get_super_admin_db() -> Session:
     finally:
         db.close()
 
+
+async def get_super_admin_read_db() -> AsyncSession:
+    """
+    Dependency for read-only endpoints (tenant lookups and listings).
+    
+    Yields a session on the read replica when POSTGRES_SUPER_ADMIN_REPLICA_URL
+    is set, except within REPLICA_READ_AFTER_WRITE_SECONDS of a tenant
+    write, when the primary is used so the change is visible.
+    """
+    session_factory = ReplicaSessionLocal if replica_available() else AsyncSessionLocal
+    async with session_factory() as db:
+        yield db
+
+
+async def get_super_admin_async_db() -> AsyncSession:
+    """
+    Dependency function to get an async database session.
+    Yields an AsyncSession and ensures it's closed after use.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
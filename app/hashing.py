@@ -0,0 +1,136 @@
+"""Password hashing on a process pool.
+
+bcrypt is deliberately slow (a few hundred ms per hash). Run in the shared
+blocking thread pool, each hash would hold one of its
+BLOCKING_EXECUTOR_WORKERS threads, which CREATE DATABASE, DDL and seeding
+need too. The pool here runs app.security.hash_password in
+PASSWORD_HASH_WORKERS separate processes (default 2) instead, so
+hashing never starves that thread pool, and bulk work such as re-seeding
+every tenant admin is spread in chunks across those processes. Every
+uvicorn worker has its own pool, so keep workers * PASSWORD_HASH_WORKERS
+within the CPUs of the container.
+
+The pool is started on first use with the "spawn" start method (forking a
+process that runs an event loop and thread pools is not safe) and is
+restarted if a worker process dies.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from threading import Lock
+from app.config import settings
+from app.security import hash_password
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = Lock()
+
+
+def hash_workers() -> int:
+    """
+    Number of hashing processes of this worker.
+
+    PASSWORD_HASH_WORKERS, or with 0 the CPUs this process may run on
+    (its affinity mask, not every CPU of the host) divided by the number of
+    uvicorn workers (WEB_CONCURRENCY).
+    """
+    if settings.PASSWORD_HASH_WORKERS > 0:
+        return settings.PASSWORD_HASH_WORKERS
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    web_workers = int(os.getenv("WEB_CONCURRENCY", "1") or "1")
+    return max(cpus // max(web_workers, 1), 1)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=hash_workers(),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"Started password hashing pool with {hash_workers()} processes")
+        return _executor
+
+
+def _reset_executor(broken: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next call starts a new one."""
+    global _executor
+    with _executor_lock:
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False)
+
+
+def _hash_batch(passwords: list) -> list:
+    """Hash a list of passwords (runs in a pool process)."""
+    return [hash_password(password) for password in passwords]
+
+
+async def _run(func, *args):
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    try:
+        return await loop.run_in_executor(executor, func, *args)
+    except BrokenProcessPool:
+        logger.warning("Password hashing pool broke, restarting it")
+        _reset_executor(executor)
+        return await loop.run_in_executor(_get_executor(), func, *args)
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash one password in the hashing pool.
+
+    Args:
+        password: Plain text password
+
+    Returns:
+        Hashed password string
+
+    Raises:
+        ValueError: If the password is empty
+    """
+    return await _run(hash_password, password)
+
+
+async def hash_passwords(passwords: list) -> list:
+    """
+    Hash many passwords in parallel across the hashing pool.
+
+    The list is split into one chunk per process, so a batch costs one
+    round trip per process instead of one per password.
+
+    Args:
+        passwords: Plain text passwords
+
+    Returns:
+        Hashed passwords, in the same order
+
+    Raises:
+        ValueError: If any password is empty
+    """
+    if not passwords:
+        return []
+
+    chunk_size = math.ceil(len(passwords) / hash_workers())
+    chunks = [passwords[i:i + chunk_size] for i in range(0, len(passwords), chunk_size)]
+    results = await asyncio.gather(*(_run(_hash_batch, chunk) for chunk in chunks))
+    return [hashed for chunk in results for hashed in chunk]
+
+
+def shutdown_password_hasher() -> None:
+    """Stop the hashing processes (a new pool is started on the next call)."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
@@ -32,3 +32,21 @@ def create_database(db_name: str) -> None:
         logger.error(f"Failed to create database {db_name}: {str(e)}")
         raise
 
+
+def database_exists(db_name: str) -> bool:
+    """
+    Check whether a database exists on the PostgreSQL server.
+    
+    Args:
+        db_name: Name of the database
+        
+    Returns:
+        True if the database exists
+    """
+    with server_engine.connect() as conn:
+        result = conn.execute(
+            text("SELECT 1 FROM pg_database WHERE datname = :name"),
+            {"name": db_name}
+        )
+        return result.first() is not None
+
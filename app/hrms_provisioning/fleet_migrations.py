@@ -0,0 +1,272 @@
+"""Fleet-wide tenant migrations.
+
+Rolls a tenant_migrations revision across every tenant database: each
+tenant's alembic_version is read in parallel, and only tenants that are
+not at the target revision are upgraded. At most `concurrency` tenants are
+handled at a time.
+
+With TENANT_MIGRATION_BUNDLES (the default), a tenant at a single revision
+is upgraded with a pre-rendered SQL bundle (app.hrms_provisioning.
+migration_bundles) sent in one round trip from the blocking thread pool.
+Otherwise Alembic runs the upgrade; it keeps its running context in module
+globals, so one process can only run one upgrade at a time (see
+app.hrms_provisioning.run_migrations) and these upgrades run in a pool of
+`concurrency` worker processes. The version reads are plain queries and
+run in the blocking thread pool.
+
+The revision found (or reached) is recorded in tenants.schema_revision.
+With on_failure="stop", tenants that have not started when a migration
+fails are skipped; with "continue", every tenant is attempted.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from sqlalchemy import create_engine, select, func
+from sqlalchemy.pool import NullPool
+from app.config import settings
+from app.concurrency import run_blocking
+from app.database import AsyncSessionLocal, tenant_db_url
+from app.superadmin.models import Tenant
+from app.superadmin.service import save_schema_revision
+from app.hrms_provisioning.run_migrations import tenant_migration_runner, run_tenant_migrations
+from app.hrms_provisioning.migration_bundles import apply_migration_bundle
+import asyncio
+import logging
+import multiprocessing
+import time
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_FAILURE_POLICIES = ("stop", "continue")
+
+# Tenants whose database exists; tenants still provisioning (or failed) are left out
+MIGRATABLE_STATUSES = ("active", "inactive")
+
+
+def resolve_target(target: str) -> tuple:
+    """
+    Revision ids a fleet migration to target ends at.
+
+    Args:
+        target: Revision, "head" or "heads"
+
+    Returns:
+        Sorted tuple of revision ids
+
+    Raises:
+        ValueError: If target does not name revisions of tenant_migrations
+            (e.g. "head" while there are several heads)
+    """
+    try:
+        revisions = tenant_migration_runner.script.get_revisions(target)
+    except Exception as e:
+        raise ValueError(f"Invalid migration target {target!r}: {str(e)}")
+    if not revisions:
+        raise ValueError(f"Invalid migration target {target!r}: no such revision")
+    return tuple(sorted(revision.revision for revision in revisions))
+
+
+def encode_revisions(revisions) -> str:
+    """Revision ids as stored in tenants.schema_revision (None if there are none)."""
+    return ",".join(sorted(revisions)) or None
+
+
+def read_tenant_revisions(db_name: str) -> tuple:
+    """
+    Revision(s) in a tenant database's alembic_version table.
+
+    Uses a throwaway connection, so scanning the fleet does not evict the
+    engines cached for active tenants.
+    """
+    engine = create_engine(tenant_db_url(db_name), poolclass=NullPool)
+    try:
+        with engine.connect() as connection:
+            return tenant_migration_runner.current_revisions(connection)
+    finally:
+        engine.dispose()
+
+
+def _upgrade_tenant(db_name: str, target: str) -> dict:
+    """Upgrade one tenant database (runs in a migration worker process)."""
+    return run_tenant_migrations(tenant_db_url(db_name), target)
+
+
+async def _record_revision(tenant_id: int, revisions) -> None:
+    try:
+        async with AsyncSessionLocal() as db:
+            await save_schema_revision(db, tenant_id, encode_revisions(revisions))
+    except Exception as e:
+        logger.error(f"Failed to record schema revision of tenant {tenant_id}: {str(e)}")
+
+
+async def migrate_tenant_fleet(
+    target: str = "head",
+    concurrency: int = None,
+    on_failure: str = "stop",
+    on_progress=None
+) -> dict:
+    """
+    Upgrade every out-of-date tenant database to target.
+
+    Tenants without an alembic_version table (created from the schema SQL
+    rather than by tenant_migrations) are reported as "unversioned" and
+    left alone.
+
+    Args:
+        target: Revision to upgrade to (default "head")
+        concurrency: Tenants handled at the same time (default
+            TENANT_MIGRATION_CONCURRENCY)
+        on_failure: "stop" to skip the tenants not started yet after the
+            first failure, "continue" to attempt every tenant
+        on_progress: Optional async callback, awaited with the progress
+            counters after every tenant
+
+    Returns:
+        Summary dict with the target revisions, counters (total, checked,
+        upgraded, up_to_date, unversioned, failed, skipped), whether the
+        run stopped early, duration_ms and one outcome per tenant
+
+    Raises:
+        ValueError: If target or on_failure is invalid
+    """
+    if on_failure not in MIGRATION_FAILURE_POLICIES:
+        raise ValueError(f"on_failure must be one of {', '.join(MIGRATION_FAILURE_POLICIES)}")
+    concurrency = max(concurrency or settings.TENANT_MIGRATION_CONCURRENCY, 1)
+    target_revisions = await run_blocking(resolve_target, target)
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Tenant.id, Tenant.db_name)
+            .where(Tenant.status.in_(MIGRATABLE_STATUSES))
+            .order_by(Tenant.id)
+        )
+        tenants = result.all()
+
+    started = time.perf_counter()
+    progress = {
+        "target": target,
+        "target_revisions": list(target_revisions),
+        "on_failure": on_failure,
+        "concurrency": concurrency,
+        "total": len(tenants),
+        "checked": 0,
+        "upgraded": 0,
+        "up_to_date": 0,
+        "unversioned": 0,
+        "failed": 0,
+        "skipped": 0,
+        "stopped": False
+    }
+    outcomes = []
+    # Bundles upgrade from one revision to one revision
+    use_bundles = settings.TENANT_MIGRATION_BUNDLES and len(target_revisions) == 1
+    semaphore = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+    executor = None
+
+    async def migrate_one(tenant_id: int, db_name: str) -> None:
+        nonlocal executor
+        async with semaphore:
+            outcome = {"tenant_id": tenant_id, "db_name": db_name}
+            tenant_started = time.perf_counter()
+
+            if progress["stopped"]:
+                outcome["status"] = "skipped"
+            else:
+                try:
+                    current = await run_blocking(read_tenant_revisions, db_name)
+                    outcome["from_revisions"] = list(current)
+
+                    if not current:
+                        outcome["status"] = "unversioned"
+                    elif set(current) == set(target_revisions):
+                        outcome["status"] = "up_to_date"
+                    elif use_bundles and len(current) == 1:
+                        upgrade = await run_blocking(apply_migration_bundle, db_name, target)
+                        current = tuple(upgrade["to_revisions"])
+                        outcome["applied"] = [step["revision"] for step in upgrade["applied"]]
+                        outcome["bundle"] = upgrade["bundle"]
+                        outcome["status"] = "upgraded"
+                    else:
+                        if executor is None:
+                            executor = ProcessPoolExecutor(
+                                max_workers=concurrency,
+                                mp_context=multiprocessing.get_context("spawn")
+                            )
+                        upgrade = await loop.run_in_executor(executor, _upgrade_tenant, db_name, target)
+                        current = tuple(upgrade["to_revisions"])
+                        outcome["applied"] = [step["revision"] for step in upgrade["applied"]]
+                        outcome["status"] = "upgraded"
+
+                    outcome["to_revisions"] = list(current)
+                    await _record_revision(tenant_id, current)
+                except Exception as e:
+                    logger.error(f"Migration of tenant {tenant_id} ({db_name}) failed: {str(e)}")
+                    outcome["status"] = "failed"
+                    outcome["error"] = str(e)
+                    if on_failure == "stop":
+                        progress["stopped"] = True
+                    if "from_revisions" in outcome:
+                        # The failed upgrade was rolled back
+                        await _record_revision(tenant_id, outcome["from_revisions"])
+
+                progress["checked"] += 1
+
+            outcome["duration_ms"] = round((time.perf_counter() - tenant_started) * 1000, 1)
+            progress[outcome["status"]] += 1
+            outcomes.append(outcome)
+
+            if on_progress is not None:
+                await on_progress(dict(progress))
+
+    logger.info(
+        f"Migrating {len(tenants)} tenants to {target} ({', '.join(target_revisions)}), "
+        f"concurrency {concurrency}, on failure: {on_failure}"
+    )
+    try:
+        await asyncio.gather(*(migrate_one(tenant_id, db_name) for tenant_id, db_name in tenants))
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    summary = dict(progress)
+    summary["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    summary["tenants"] = sorted(outcomes, key=lambda outcome: outcome["tenant_id"])
+    logger.info(
+        f"Tenant migration to {target} done: {summary['upgraded']} upgraded, "
+        f"{summary['up_to_date']} up to date, {summary['unversioned']} unversioned, "
+        f"{summary['failed']} failed, {summary['skipped']} skipped"
+    )
+    return summary
+
+
+async def fleet_revision_status(db) -> dict:
+    """
+    Head revision(s) and the number of tenants recorded at each revision.
+
+    Read from tenants.schema_revision, without connecting to tenant
+    databases; tenants never checked by a fleet migration are counted as
+    unchecked.
+    """
+    heads = await run_blocking(tenant_migration_runner.head_revisions)
+    result = await db.execute(
+        select(Tenant.schema_revision, Tenant.schema_checked_at.is_(None), func.count())
+        .where(Tenant.status.in_(MIGRATABLE_STATUSES))
+        .group_by(Tenant.schema_revision, Tenant.schema_checked_at.is_(None))
+    )
+
+    revisions = {}
+    unchecked = 0
+    unversioned = 0
+    for revision, never_checked, count in result.all():
+        if never_checked:
+            unchecked += count
+        elif revision is None:
+            unversioned += count
+        else:
+            revisions[revision] = revisions.get(revision, 0) + count
+
+    return {
+        "head_revisions": sorted(heads),
+        "revisions": revisions,
+        "unversioned": unversioned,
+        "unchecked": unchecked
+    }
@@ -0,0 +1,196 @@
+"""Pre-rendered SQL bundles for tenant migrations.
+
+Running tenant_migrations through Alembic interprets every revision script
+and its op.* calls again for each tenant database. A bundle is the upgrade
+from one revision to another rendered once in Alembic's offline (--sql)
+mode, including the alembic_version updates and BEGIN/COMMIT. It is then
+sent to each tenant database as a single script, one round trip per
+tenant.
+
+Bundles are cached in memory and in TENANT_MIGRATION_BUNDLE_DIR, keyed by
+a checksum of the revision range: the start and target revision and the
+source of env.py and of every revision script in the range. Editing a
+revision therefore never serves a stale bundle. Bundles missing from the
+cache are rendered on first use; scripts/build_migration_bundles.py
+renders all of them ahead of time (e.g. at image build).
+"""
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+from app.config import settings
+from app.database import tenant_db_url
+from app.hrms_provisioning.run_migrations import tenant_migration_runner, PROJECT_ROOT
+from pathlib import Path
+from threading import Lock
+import hashlib
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+# Rendered bundles of this process by checksum
+_bundles = {}
+_render_lock = Lock()
+
+
+def bundle_dir() -> Path:
+    """Directory holding the rendered bundles (relative paths are below the project root)."""
+    return PROJECT_ROOT / settings.TENANT_MIGRATION_BUNDLE_DIR
+
+
+def target_revision(target: str) -> str:
+    """
+    The single revision id target names.
+
+    Raises:
+        ValueError: If target is unknown or names several revisions
+            (several heads need the Alembic runner)
+    """
+    try:
+        revisions = tenant_migration_runner.script.get_revisions(target)
+    except Exception as e:
+        raise ValueError(f"Invalid migration target {target!r}: {str(e)}")
+    if len(revisions) != 1:
+        raise ValueError(f"Migration target {target!r} does not name a single revision")
+    return revisions[0].revision
+
+
+def range_revisions(start: str, target: str) -> list:
+    """Revision ids applied when upgrading from start (None = empty database) to target, in order."""
+    script = tenant_migration_runner.script
+    revisions = script.iterate_revisions(target, start or "base")
+    return [revision.revision for revision in reversed(list(revisions)) if revision.revision != start]
+
+
+def bundle_checksum(start: str, target: str) -> str:
+    """Checksum of the revision range start -> target (sha256 hex)."""
+    script = tenant_migration_runner.script
+    digest = hashlib.sha256(f"{start or 'base'}->{target}".encode())
+    digest.update(Path(script.env_py_location).read_bytes())
+    for revision_id in range_revisions(start, target):
+        digest.update(revision_id.encode())
+        digest.update(Path(script.get_revision(revision_id).path).read_bytes())
+    return digest.hexdigest()
+
+
+def get_bundle(start: str, target: str) -> tuple:
+    """
+    SQL upgrading a tenant database from start to target, rendering it if not cached.
+
+    Args:
+        start: Revision the database is at (None for an empty database)
+        target: Revision id to upgrade to
+
+    Returns:
+        (checksum, sql)
+    """
+    checksum = bundle_checksum(start, target)
+    sql = _bundles.get(checksum)
+    if sql is not None:
+        return checksum, sql
+
+    with _render_lock:
+        sql = _bundles.get(checksum)
+        if sql is None:
+            path = bundle_dir() / f"{checksum}.sql"
+            if path.exists():
+                sql = path.read_text()
+            else:
+                logger.info(f"Rendering tenant migration bundle {start or 'base'} -> {target}")
+                sql = tenant_migration_runner.render_sql(start, target)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                partial = path.with_suffix(f".{os.getpid()}.tmp")
+                partial.write_text(sql)
+                partial.replace(path)
+            _bundles[checksum] = sql
+
+    return checksum, sql
+
+
+def build_bundles(target: str = "heads") -> list:
+    """
+    Render the bundles from every earlier revision (and from an empty database) to target.
+
+    Args:
+        target: Revision, "head" or "heads" (one set of bundles per head)
+
+    Returns:
+        List of dicts with start, target, checksum and path of each bundle
+    """
+    script = tenant_migration_runner.script
+    built = []
+    for head in script.get_revisions(target):
+        starts = [None] + [revision_id for revision_id in range_revisions(None, head.revision) if revision_id != head.revision]
+        for start in starts:
+            checksum, _ = get_bundle(start, head.revision)
+            built.append({
+                "start": start,
+                "target": head.revision,
+                "checksum": checksum,
+                "path": str(bundle_dir() / f"{checksum}.sql")
+            })
+    return built
+
+
+def apply_migration_bundle(db_name: str, target: str = "head") -> dict:
+    """
+    Upgrade a tenant database to target with a pre-rendered bundle.
+
+    The bundle runs in its own transaction (BEGIN ... COMMIT inside the
+    script) and is sent as one statement batch.
+
+    Args:
+        db_name: Name of the tenant database
+        target: Revision to upgrade to (must name a single revision)
+
+    Returns:
+        dict like TenantMigrationRunner.upgrade (from_revisions,
+        to_revisions, applied, duration_ms) plus the bundle checksum
+
+    Raises:
+        ValueError: If the database is at several revisions (branches) or
+            target is not a single revision
+        Exception: If the bundle fails (nothing of it is committed)
+    """
+    target_id = target_revision(target)
+    engine = create_engine(tenant_db_url(db_name), poolclass=NullPool)
+    try:
+        with engine.connect() as connection:
+            started = time.perf_counter()
+            from_revisions = tenant_migration_runner.current_revisions(connection)
+            connection.rollback()
+            if len(from_revisions) > 1:
+                raise ValueError(f"{db_name} is at several revisions ({', '.join(from_revisions)})")
+
+            start = from_revisions[0] if from_revisions else None
+            checksum = None
+            applied = []
+            if start != target_id:
+                checksum, sql = get_bundle(start, target_id)
+                applied = range_revisions(start, target_id)
+                script_connection = connection.execution_options(isolation_level="AUTOCOMMIT", no_parameters=True)
+                try:
+                    script_connection.exec_driver_sql(sql)
+                except Exception:
+                    # Leave the aborted transaction of the script
+                    try:
+                        script_connection.exec_driver_sql("ROLLBACK")
+                    except Exception:
+                        pass
+                    raise
+
+            to_revisions = tenant_migration_runner.current_revisions(connection)
+            duration_ms = round((time.perf_counter() - started) * 1000, 1)
+    finally:
+        engine.dispose()
+
+    return {
+        "from_revisions": list(from_revisions),
+        "to_revisions": list(to_revisions),
+        "applied": [
+            {"revision": revision_id, "message": tenant_migration_runner.script.get_revision(revision_id).doc}
+            for revision_id in applied
+        ],
+        "bundle": checksum,
+        "duration_ms": duration_ms
+    }
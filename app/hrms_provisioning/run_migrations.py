@@ -1,80 +1,272 @@
-"""Module for running tenant database migrations using subprocess.
+"""Module for running tenant database migrations in-process.
 
-This module runs Alembic migrations via subprocess to avoid importing
-any HRMS backend code. All migrations are self-contained in tenant_migrations/.
+Alembic used to run as one subprocess per tenant
+(`alembic -c tenant_migrations/alembic.ini upgrade head`), which paid an
+interpreter start, the Alembic import and a new engine every time. The
+runner here builds the Alembic Config and ScriptDirectory once per process,
+so the revision scripts are parsed once and reused for every tenant, and
+runs the upgrade on a connection supplied by the caller (handed to
+tenant_migrations/env.py through config.attributes["connection"]).
+
+Alembic keeps the running migration context in module globals, so one
+process runs one upgrade at a time. Migrations still do NOT import any
+HRMS backend code; they stay self-contained in tenant_migrations/.
 """
-import subprocess
-import logging
-import os
+from alembic.config import Config
+from alembic.runtime.environment import EnvironmentContext
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+from app.database import get_tenant_engine
+from io import StringIO
 from pathlib import Path
+from threading import Lock
+import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# Get the path to tenant_migrations/alembic.ini
+# Use absolute path to ensure it works from any directory
+PROJECT_ROOT = Path(__file__).resolve().parents[2]  # repo root
+TENANT_ALEMBIC_INI = PROJECT_ROOT / "tenant_migrations" / "alembic.ini"
+
+
+class _CaptureHandler(logging.Handler):
+    """Collects the log records Alembic emits during one upgrade."""
+
+    def __init__(self):
+        super().__init__(level=logging.INFO)
+        self.records = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append({
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        })
+
+
+class TenantMigrationRunner:
+    """
+    Runs tenant migrations in-process with a cached Config and ScriptDirectory.
+
+    The ScriptDirectory memoizes the parsed revision map, so only the first
+    upgrade in a process reads the revision files.
+    """
+
+    def __init__(self, ini_path: Path = TENANT_ALEMBIC_INI):
+        self.ini_path = Path(ini_path)
+        self._config = None
+        self._script = None
+        self._lock = Lock()
+
+    @property
+    def config(self) -> Config:
+        if self._config is None:
+            if not self.ini_path.exists():
+                raise FileNotFoundError(
+                    f"Tenant migrations configuration not found at: {self.ini_path}"
+                )
+            config = Config(str(self.ini_path))
+            # script_location is relative to the project root
+            config.set_main_option(
+                "script_location",
+                str(self.ini_path.parent.parent / config.get_main_option("script_location"))
+            )
+            # Keep the service's logging configuration
+            config.attributes["configure_logger"] = False
+            self._config = config
+        return self._config
+
+    @property
+    def script(self) -> ScriptDirectory:
+        if self._script is None:
+            self._script = ScriptDirectory.from_config(self.config)
+        return self._script
+
+    def head_revisions(self) -> tuple:
+        """Head revision(s) of the tenant migration scripts."""
+        return tuple(self.script.get_heads())
+
+    def current_revisions(self, connection) -> tuple:
+        """Revision(s) recorded in a tenant database's alembic_version table."""
+        return tuple(MigrationContext.configure(connection).get_current_heads())
+
+    def upgrade(self, connection, target: str = "head") -> dict:
+        """
+        Upgrade the database behind connection to target.
+
+        Runs inside the connection's transaction if one is open (the caller
+        commits), otherwise in a transaction of its own that is committed.
+
+        Args:
+            connection: SQLAlchemy connection to the tenant database
+            target: Revision to upgrade to (default "head")
+
+        Returns:
+            dict with from_revisions, to_revisions, the applied steps
+            (revision, down_revisions, message), the captured Alembic log
+            records and duration_ms
+
+        Raises:
+            Exception: If a migration fails (the transaction is rolled back)
+        """
+        script = self.script
+        applied = []
+
+        def upgrade_revs(rev, context):
+            steps = script._upgrade_revs(target, rev)
+            for step in steps:
+                applied.append({
+                    "revision": step.revision.revision,
+                    "down_revisions": list(step.from_revisions),
+                    "message": step.doc
+                })
+            return steps
+
+        capture = _CaptureHandler()
+        alembic_logger = logging.getLogger("alembic")
 
-def run_tenant_migrations(db_url: str) -> None:
+        with self._lock:
+            started = time.perf_counter()
+            # Reading the version table autobegins a transaction; commit it
+            # here unless the caller had one open already
+            owns_transaction = not connection.in_transaction()
+            self.config.attributes["connection"] = connection
+            try:
+                from_revisions = self.current_revisions(connection)
+                alembic_level = alembic_logger.level
+                alembic_logger.setLevel(logging.INFO)
+                alembic_logger.addHandler(capture)
+                try:
+                    with EnvironmentContext(
+                        self.config,
+                        script,
+                        fn=upgrade_revs,
+                        destination_rev=target
+                    ):
+                        script.run_env()
+                finally:
+                    alembic_logger.removeHandler(capture)
+                    alembic_logger.setLevel(alembic_level)
+                to_revisions = self.current_revisions(connection)
+                if owns_transaction:
+                    connection.commit()
+            except Exception:
+                if owns_transaction:
+                    connection.rollback()
+                raise
+            finally:
+                self.config.attributes.pop("connection", None)
+            duration_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        return {
+            "from_revisions": list(from_revisions),
+            "to_revisions": list(to_revisions),
+            "applied": applied,
+            "log": capture.records,
+            "duration_ms": duration_ms
+        }
+
+    def render_sql(self, start: str, target: str, dialect_url: str = "postgresql://") -> str:
+        """
+        Render the upgrade from start to target as SQL (Alembic --sql mode).
+
+        Args:
+            start: Revision the database is at (None for an empty database)
+            target: Revision to upgrade to
+            dialect_url: URL naming the SQL dialect to render for (no
+                connection is made)
+
+        Returns:
+            The SQL script, including the alembic_version updates
+        """
+        script = self.script
+        buffer = StringIO()
+
+        def upgrade_revs(rev, context):
+            return script._upgrade_revs(target, rev)
+
+        with self._lock:
+            # The Config is shared with upgrade(); only set the URL for this render
+            previous_url = self.config.get_main_option("sqlalchemy.url")
+            self.config.set_main_option("sqlalchemy.url", dialect_url)
+            try:
+                with EnvironmentContext(
+                    self.config,
+                    script,
+                    fn=upgrade_revs,
+                    as_sql=True,
+                    starting_rev=start,
+                    destination_rev=target,
+                    output_buffer=buffer
+                ):
+                    script.run_env()
+            finally:
+                if previous_url is None:
+                    self.config.remove_main_option("sqlalchemy.url")
+                else:
+                    self.config.set_main_option("sqlalchemy.url", previous_url)
+
+        return buffer.getvalue()
+
+
+tenant_migration_runner = TenantMigrationRunner()
+
+
+def upgrade_tenant_database(db_name: str, target: str = "head") -> dict:
+    """
+    Run tenant migrations on a tenant database through its shared engine.
+
+    Args:
+        db_name: Name of the tenant database
+        target: Revision to upgrade to (default "head")
+
+    Returns:
+        The structured result of TenantMigrationRunner.upgrade
+    """
+    with get_tenant_engine(db_name).connect() as connection:
+        return tenant_migration_runner.upgrade(connection, target)
+
+
+def run_tenant_migrations(db_url: str, target: str = "head") -> dict:
     """
-    Run tenant database migrations using Alembic subprocess.
-    
+    Run tenant database migrations in-process.
+
     This function:
-    1. Sets DATABASE_URL environment variable
-    2. Runs: alembic -c tenant_migrations/alembic.ini upgrade head
+    1. Connects to db_url (no pooling, the connection is closed afterwards)
+    2. Runs the equivalent of: alembic -c tenant_migrations/alembic.ini upgrade <target>
     3. Does NOT import any HRMS backend code
-    
+
     Args:
         db_url: Database URL for the tenant database
-        
+        target: Revision to upgrade to (default "head")
+
+    Returns:
+        The structured result of TenantMigrationRunner.upgrade
+
     Raises:
         Exception: If migrations fail
     """
-    # Get the path to tenant_migrations/alembic.ini
-    # Use absolute path to ensure it works from any directory
-    project_root = Path(__file__).resolve().parents[2]  # repo root
-    alembic_ini_path = project_root / "tenant_migrations" / "alembic.ini"
-
-    
-    if not alembic_ini_path.exists():
-        raise FileNotFoundError(
-            f"Tenant migrations configuration not found at: {alembic_ini_path}"
-        )
-    
-    logger.info(f"Running tenant migrations from: {alembic_ini_path}")
+    logger.info(f"Running tenant migrations from: {tenant_migration_runner.ini_path}")
     logger.info(f"Target database: {db_url[:50]}...")
-    
-    # Prepare environment variables
-    env = os.environ.copy()
-    env['DATABASE_URL'] = db_url
-    
-    # Run alembic upgrade head via subprocess
+
+    engine = create_engine(db_url, poolclass=NullPool)
     try:
-        result = subprocess.run(
-            [
-                'alembic',
-                '-c', str(alembic_ini_path),
-                'upgrade', 'head'
-            ],
-            env=env,
-            capture_output=True,
-            text=True,
-            check=True,
-            cwd=str(project_root)
-  # Run from project root
-        )
-        
-        logger.info("Migration subprocess completed successfully")
-        logger.info(f"Output: {result.stdout}")
-        
-        if result.stderr:
-            logger.warning(f"Migration warnings: {result.stderr}")
-            
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Migration failed with exit code {e.returncode}")
-        logger.error(f"stdout: {e.stdout}")
-        logger.error(f"stderr: {e.stderr}")
-        raise Exception(
-            f"Failed to run tenant migrations: {e.stderr or e.stdout or str(e)}"
-        )
+        with engine.connect() as connection:
+            result = tenant_migration_runner.upgrade(connection, target)
     except FileNotFoundError:
-        raise Exception(
-            "Alembic command not found. Make sure alembic is installed: "
-            "pip install alembic"
-        )
+        raise
+    except Exception as e:
+        logger.error(f"Migration failed: {str(e)}")
+        raise Exception(f"Failed to run tenant migrations: {str(e)}")
+    finally:
+        engine.dispose()
+
+    logger.info(
+        f"Tenant migrations completed: {result['from_revisions']} -> {result['to_revisions']}, "
+        f"{len(result['applied'])} applied in {result['duration_ms']}ms"
+    )
+    return result
@@ -3,13 +3,20 @@
 This module directly inserts the admin user using SQLAlchemy Core (not ORM)
 to avoid importing any HRMS backend models.
 """
-from sqlalchemy import create_engine, text, MetaData, Table
+from sqlalchemy import text, MetaData, Table
+from app.database import get_tenant_engine
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-def seed_initial_admin(db_url: str, admin_email: str, hashed_password: str, tenant_id: int) -> None:
+def seed_initial_admin(
+    db_name: str,
+    admin_email: str,
+    hashed_password: str,
+    tenant_id: int,
+    reset_existing: bool = False
+) -> bool:
     """
     Seed an initial admin user into a tenant database using SQL.
     
@@ -17,17 +24,22 @@ def seed_initial_admin(db_url: str, admin_email: str, hashed_password: str, tena
     without importing any HRMS backend models.
     
     Args:
-        db_url: Database URL for the tenant database
+        db_name: Name of the tenant database
         admin_email: Email address for the admin user
         hashed_password: Bcrypt hashed password (already hashed)
         tenant_id: The Super Admin tenant ID this database belongs to
+        reset_existing: If the admin user already exists, set its password
+            to hashed_password (used when resuming a provisioning run)
+        
+    Returns:
+        True if the admin user was inserted, False if it already existed
         
     Raises:
         Exception: If seeding fails
     """
     try:
-        # Create engine for tenant database
-        engine = create_engine(db_url, pool_pre_ping=True)
+        # Shared engine for the tenant database
+        engine = get_tenant_engine(db_name)
         
         with engine.connect() as connection:
             # Check if users table exists
@@ -55,7 +67,14 @@ def seed_initial_admin(db_url: str, admin_email: str, hashed_password: str, tena
             
             if existing_user:
                 logger.warning(f"Admin user with email {admin_email} already exists")
-                return
+                if reset_existing:
+                    connection.execute(
+                        text("UPDATE users SET hashed_password = :hashed_password WHERE email = :email"),
+                        {"email": admin_email, "hashed_password": hashed_password}
+                    )
+                    connection.commit()
+                    logger.info(f"Reset password of existing admin user: {admin_email}")
+                return False
             
             # Extract name from email for full_name
             email_name = admin_email.split('@')[0] if '@' in admin_email else "Admin"
@@ -90,6 +109,7 @@ def seed_initial_admin(db_url: str, admin_email: str, hashed_password: str, tena
             connection.commit()
             
             logger.info(f"Successfully seeded admin user: {admin_email}")
+            return True
             
     except Exception as e:
         logger.error(f"Failed to seed admin user: {str(e)}")
@@ -0,0 +1,223 @@
+"""Warm pool of spare tenant databases.
+
+CREATE DATABASE (from DDL or the schema template) is the slowest part of
+tenant creation and serializes on the PostgreSQL server. With
+TENANT_SPARE_POOL_SIZE > 0, a background task keeps that many databases
+with the perfect schema applied ready ahead of time, named
+hrms_spare_<schema version>_<random>. Tenant creation claims one by
+renaming it to the tenant's db_name (ALTER DATABASE ... RENAME is atomic,
+so two claims can never get the same spare) and then only runs the
+per-tenant update and the admin seed.
+
+Spares are built as <name>_build and renamed once complete, so a
+half-built database is never claimed. Refills are serialized across
+workers with an advisory lock; spares of other schema versions and
+leftover builds are dropped by the next refill.
+"""
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from app.config import settings
+from app.concurrency import run_blocking
+from app.database import server_engine, get_tenant_engine, tenant_engines
+from app.hrms_provisioning.database_creator import create_database
+from app.hrms_provisioning.template_db import create_database_from_template
+from app.superadmin.create_perfect_schema import RESET_SCHEMA_SQL, PERFECT_SCHEMA_SQL, PERFECT_SCHEMA_VERSION
+import asyncio
+import logging
+import random
+import uuid
+
+logger = logging.getLogger(__name__)
+
+SPARE_PREFIX = "hrms_spare_"
+
+# Session-level advisory lock serializing spare pool refills across workers
+SPARE_POOL_LOCK_KEY = 7_341_003
+
+
+def spare_prefix(version: str = PERFECT_SCHEMA_VERSION) -> str:
+    """Name prefix of the spare databases for a schema version."""
+    return f"{SPARE_PREFIX}{version}_"
+
+
+def _list_spares(connection) -> tuple:
+    """
+    Spare databases on the server.
+
+    Returns:
+        (ready spares of the current schema version, every other spare
+        database: other versions and leftover builds)
+    """
+    names = connection.execute(
+        text("SELECT datname FROM pg_database WHERE starts_with(datname, :prefix) ORDER BY datname"),
+        {"prefix": SPARE_PREFIX}
+    ).scalars().all()
+
+    current = spare_prefix()
+    ready = [name for name in names if name.startswith(current) and not name.endswith("_build")]
+    other = [name for name in names if name not in ready]
+    return ready, other
+
+
+def _build_spare(connection) -> str:
+    """Create one spare database with the perfect schema applied (no tenant settings)."""
+    spare_name = f"{spare_prefix()}{uuid.uuid4().hex[:8]}"
+    build_name = f"{spare_name}_build"
+
+    if settings.TENANT_PROVISIONING_MODE == "template":
+        create_database_from_template(build_name)
+    else:
+        create_database(build_name)
+        try:
+            with get_tenant_engine(build_name).begin() as build:
+                build.execute(text(RESET_SCHEMA_SQL))
+                build.execute(text(PERFECT_SCHEMA_SQL))
+        finally:
+            # Renaming requires that nobody is connected
+            tenant_engines.dispose(build_name)
+
+    connection.execute(text(f'ALTER DATABASE "{build_name}" RENAME TO "{spare_name}"'))
+    return spare_name
+
+
+def refill_spare_pool() -> int:
+    """
+    Create spare databases until TENANT_SPARE_POOL_SIZE are ready.
+
+    Does nothing if another worker is refilling at the same time.
+
+    Returns:
+        Number of spare databases created
+    """
+    created = 0
+    with server_engine.connect() as connection:
+        locked = connection.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": SPARE_POOL_LOCK_KEY}
+        ).scalar()
+        if not locked:
+            return 0
+
+        try:
+            ready, other = _list_spares(connection)
+            for name in other:
+                logger.info(f"Dropping outdated spare database {name}")
+                try:
+                    connection.execute(text(f'DROP DATABASE IF EXISTS "{name}"'))
+                except DBAPIError as e:
+                    logger.error(f"Failed to drop spare database {name}: {str(e)}")
+
+            while len(ready) + created < settings.TENANT_SPARE_POOL_SIZE:
+                spare_name = _build_spare(connection)
+                created += 1
+                logger.info(f"Spare database {spare_name} ready")
+        finally:
+            connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": SPARE_POOL_LOCK_KEY})
+
+    return created
+
+
+def claim_spare_database(db_name: str) -> bool:
+    """
+    Take a ready spare database and rename it to db_name.
+
+    Args:
+        db_name: Name the tenant database should get
+
+    Returns:
+        True if a spare was claimed, False if none was available
+    """
+    safe_db_name = db_name.replace('"', '""')
+    with server_engine.connect() as connection:
+        ready, _ = _list_spares(connection)
+        # Concurrent claims start at different spares
+        random.shuffle(ready)
+
+        for spare_name in ready:
+            try:
+                connection.execute(text(f'ALTER DATABASE "{spare_name}" RENAME TO "{safe_db_name}"'))
+            except DBAPIError as e:
+                # Claimed by someone else in the meantime
+                logger.warning(f"Could not claim spare database {spare_name}: {str(e)}")
+                continue
+
+            logger.info(f"Claimed spare database {spare_name} as {db_name}")
+            return True
+
+    return False
+
+
+def spare_pool_status() -> dict:
+    """Configured size and ready spare databases of the current schema version."""
+    with server_engine.connect() as connection:
+        ready, _ = _list_spares(connection)
+
+    return {
+        "schema_version": PERFECT_SCHEMA_VERSION,
+        "target": settings.TENANT_SPARE_POOL_SIZE,
+        "available": len(ready),
+        "databases": ready
+    }
+
+
+class SparePoolRefiller:
+    """
+    Background task topping up the spare pool.
+
+    Refills every interval seconds, and right away after wake() (called
+    when a spare was claimed).
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task = None
+        self._wake = None
+        self.created = 0
+        self.last_error = None
+
+    async def start(self) -> None:
+        """Start the background refill loop."""
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop refilling (a build in progress finishes in the blocking executor)."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def wake(self) -> None:
+        """Refill now instead of at the next interval."""
+        if self._wake is not None:
+            self._wake.set()
+
+    def stats(self) -> dict:
+        """Return refill state of this process for monitoring."""
+        return {
+            "running": self._task is not None,
+            "interval_seconds": self.interval,
+            "created": self.created,
+            "last_error": self.last_error
+        }
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            try:
+                self.created += await run_blocking(refill_spare_pool)
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Failed to refill spare database pool: {str(e)}")
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+spare_pool_refiller = SparePoolRefiller(interval=settings.TENANT_SPARE_POOL_REFILL_SECONDS)
@@ -0,0 +1,180 @@
+"""Template-database provisioning for tenant databases.
+
+Instead of pushing the full HRMS DDL into every new tenant database, a
+golden template database is built once from PERFECT_SCHEMA_SQL and new
+tenant databases are cloned from it with CREATE DATABASE ... TEMPLATE,
+which is a file-level copy on the server. Only the per-tenant UPDATE and
+the admin seed then run against the new database.
+
+The template is versioned by PERFECT_SCHEMA_VERSION (a hash of the DDL),
+so changing the schema definition makes the next provisioning build a new
+template; templates of older versions are dropped. The template does not
+accept connections, since PostgreSQL refuses to clone a database that has
+other sessions connected.
+"""
+from app.database import server_engine, get_tenant_engine, tenant_engines
+from app.superadmin.create_perfect_schema import (
+    RESET_SCHEMA_SQL,
+    PERFECT_SCHEMA_SQL,
+    PERFECT_SCHEMA_VERSION,
+    TENANT_ADMIN_UPDATE_SQL
+)
+from sqlalchemy import text
+import logging
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_PREFIX = "hrms_template_"
+
+# Session-level advisory lock serializing template builds across workers
+TEMPLATE_LOCK_KEY = 7_341_002
+
+# Template already verified by this process
+_ready_template = None
+
+
+def template_db_name(version: str = PERFECT_SCHEMA_VERSION) -> str:
+    """Name of the template database for a schema version."""
+    return f"{TEMPLATE_PREFIX}{version}"
+
+
+def _drop_database(connection, db_name: str) -> None:
+    """Drop a (template) database. connection must be in AUTOCOMMIT mode."""
+    connection.execute(text(f'ALTER DATABASE "{db_name}" WITH IS_TEMPLATE false'))
+    connection.execute(text(f'DROP DATABASE "{db_name}"'))
+
+
+def _build_template(connection, db_name: str) -> None:
+    """Create db_name from PERFECT_SCHEMA_SQL and mark it as a template."""
+    build_name = f"{db_name}_build"
+    connection.execute(text(f'DROP DATABASE IF EXISTS "{build_name}"'))
+    connection.execute(text(f'CREATE DATABASE "{build_name}"'))
+
+    try:
+        with get_tenant_engine(build_name).begin() as build:
+            build.execute(text(RESET_SCHEMA_SQL))
+            build.execute(text(PERFECT_SCHEMA_SQL))
+    finally:
+        # Renaming and cloning require that nobody is connected
+        tenant_engines.dispose(build_name)
+
+    connection.execute(text(f'ALTER DATABASE "{build_name}" RENAME TO "{db_name}"'))
+    connection.execute(text(f'ALTER DATABASE "{db_name}" WITH IS_TEMPLATE true ALLOW_CONNECTIONS false'))
+
+
+def ensure_template(rebuild: bool = False) -> str:
+    """
+    Make sure the template database for the current schema version exists.
+
+    Builds it if missing (or always, with rebuild=True) and drops templates
+    of other schema versions. Safe to call concurrently from several
+    workers.
+
+    Args:
+        rebuild: Drop and rebuild the template even if it exists
+
+    Returns:
+        Name of the template database
+    """
+    global _ready_template
+    db_name = template_db_name()
+    if not rebuild and _ready_template == db_name:
+        return db_name
+
+    with server_engine.connect() as connection:
+        connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": TEMPLATE_LOCK_KEY})
+        try:
+            exists = connection.execute(
+                text("SELECT 1 FROM pg_database WHERE datname = :name"),
+                {"name": db_name}
+            ).first() is not None
+
+            if exists and rebuild:
+                logger.info(f"Dropping tenant template {db_name} for rebuild")
+                _drop_database(connection, db_name)
+                exists = False
+
+            if not exists:
+                logger.info(f"Building tenant template {db_name}...")
+                _build_template(connection, db_name)
+                logger.info(f"✅ Tenant template {db_name} built")
+
+            stale = connection.execute(
+                text("SELECT datname FROM pg_database WHERE starts_with(datname, :prefix) AND datname <> :name"),
+                {"prefix": TEMPLATE_PREFIX, "name": db_name}
+            ).scalars().all()
+            for stale_name in stale:
+                logger.info(f"Dropping outdated tenant template {stale_name}")
+                _drop_database(connection, stale_name)
+        finally:
+            connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": TEMPLATE_LOCK_KEY})
+
+    _ready_template = db_name
+    return db_name
+
+
+def create_database_from_template(db_name: str) -> None:
+    """
+    Create a tenant database as a copy of the current schema template.
+
+    Args:
+        db_name: Name of the database to create
+
+    Raises:
+        Exception: If the template cannot be built or the database cannot be created
+    """
+    global _ready_template
+    template_name = ensure_template()
+    safe_db_name = db_name.replace('"', '""')
+
+    try:
+        with server_engine.connect() as connection:
+            connection.execute(text(f'CREATE DATABASE "{safe_db_name}" TEMPLATE "{template_name}"'))
+        logger.info(f"Created database {db_name} from template {template_name}")
+    except Exception:
+        # Re-check the template on the next call (it may have been dropped)
+        _ready_template = None
+        raise
+
+
+def apply_tenant_settings(db_name: str, tenant_id: int) -> dict:
+    """
+    Run the per-tenant part of schema creation on a database cloned from the template.
+
+    Args:
+        db_name: Name of the tenant database
+        tenant_id: The Super Admin tenant ID
+
+    Returns:
+        dict with status and message, like create_perfect_tenant_schema
+    """
+    try:
+        with get_tenant_engine(db_name).begin() as connection:
+            result = connection.execute(text(TENANT_ADMIN_UPDATE_SQL), {"tenant_id": tenant_id})
+
+        return {
+            "status": "success",
+            "message": f"Schema cloned from template for {db_name}, updated {result.rowcount} admin users"
+        }
+    except Exception as e:
+        logger.error(f"Failed to apply tenant settings for {db_name}: {str(e)}")
+        return {
+            "status": "error",
+            "message": f"Failed to apply tenant settings: {str(e)}"
+        }
+
+
+def template_status() -> dict:
+    """Current schema version and whether its template database exists."""
+    db_name = template_db_name()
+    with server_engine.connect() as connection:
+        exists = connection.execute(
+            text("SELECT 1 FROM pg_database WHERE datname = :name AND datistemplate"),
+            {"name": db_name}
+        ).first() is not None
+
+    return {
+        "schema_version": PERFECT_SCHEMA_VERSION,
+        "template_db": db_name,
+        "exists": exists
+    }
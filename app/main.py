@@ -1,10 +1,21 @@
 """Main FastAPI application."""
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from app.superadmin.router import router as super_admin_router
 from app.tenants.router import router as tenants_router
-from app.database import init_db
+from app.database import init_db, super_admin_async_engine, super_admin_replica_engine, tenant_engines
+from app.pooling import pool_stats
+from app.metrics import histograms, render_prometheus
+from app.concurrency import shutdown_blocking_executor
+from app.hashing import shutdown_password_hasher
+from app.tenants.events import tenant_event_broadcaster
+from app.superadmin.jobs import provisioning_jobs
+from app.concurrency import run_blocking
+from app.hrms_provisioning.template_db import ensure_template
+from app.hrms_provisioning.spare_pool import spare_pool_refiller
+from app.config import settings
+import asyncio
 import logging
 import traceback
 import os
@@ -53,6 +64,10 @@ app.add_middleware(
 app.include_router(super_admin_router)
 app.include_router(tenants_router)
 
+# Background build of the tenant schema template, kept so it is not garbage
+# collected before it finishes and can be cancelled on shutdown
+app.state.template_warmup = None
+
 
 @app.on_event("startup")
 async def startup_event():
@@ -62,6 +77,54 @@ async def startup_event():
         logger.info("Database initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize database: {str(e)}")
+    
+    # Listen for tenant changes (cross-worker cache invalidation + event stream)
+    if settings.TENANT_EVENTS_LISTENER_ENABLED:
+        await tenant_event_broadcaster.start()
+    
+    # Background provisioning workers (also resumes jobs left queued by a previous process)
+    try:
+        await provisioning_jobs.start()
+    except Exception as e:
+        logger.error(f"Failed to start provisioning job queue: {str(e)}")
+    
+    # Build the tenant schema template in the background so the first tenant creation is fast
+    if settings.TENANT_PROVISIONING_MODE == "template":
+        app.state.template_warmup = asyncio.create_task(warm_tenant_template())
+    
+    # Keep spare tenant databases ready (warm pool)
+    if settings.TENANT_SPARE_POOL_SIZE > 0:
+        await spare_pool_refiller.start()
+
+
+async def warm_tenant_template():
+    """Make sure the tenant schema template exists (see app.hrms_provisioning.template_db)."""
+    try:
+        template_name = await run_blocking(ensure_template)
+        logger.info(f"Tenant schema template ready: {template_name}")
+    except Exception as e:
+        logger.error(f"Failed to prepare tenant schema template: {str(e)}")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release database connections, the blocking executor and the hashing pool on shutdown."""
+    await tenant_event_broadcaster.stop()
+    await provisioning_jobs.stop()
+    if app.state.template_warmup is not None:
+        app.state.template_warmup.cancel()
+        try:
+            await app.state.template_warmup
+        except asyncio.CancelledError:
+            pass
+        app.state.template_warmup = None
+    await spare_pool_refiller.stop()
+    await super_admin_async_engine.dispose()
+    if super_admin_replica_engine is not None:
+        await super_admin_replica_engine.dispose()
+    tenant_engines.dispose_all()
+    shutdown_blocking_executor()
+    shutdown_password_hasher()
 
 
 @app.get("/")
@@ -76,6 +139,44 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/health/pools")
+async def pool_health():
+    """
+    Live connection pool statistics of this worker.
+    
+    For every engine: pool size, checked in/out connections, overflow in
+    use, and checkout counters (waits on an exhausted pool, timeouts,
+    checkout latency). Tenant database engines are summarized separately.
+    """
+    return {
+        "pid": os.getpid(),
+        "pools": pool_stats(),
+        "tenant_engines": tenant_engines.stats()
+    }
+
+
+@app.get("/health/provisioning")
+async def provisioning_health():
+    """
+    Tenant provisioning timings of this worker.
+    
+    Histograms of the duration of each provisioning step and of whole
+    provisioning runs, per database host and outcome (count, avg, p50, p95,
+    max and bucket counts, in ms), plus the provisioning job queue state.
+    """
+    return {
+        "pid": os.getpid(),
+        "histograms": {name: h.snapshot() for name, h in histograms.items()},
+        "jobs": provisioning_jobs.stats()
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Histogram metrics of this worker in the Prometheus text format."""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler to log all errors."""
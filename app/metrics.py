@@ -0,0 +1,119 @@
+"""In-process histogram metrics.
+
+Histograms with fixed buckets and labels, kept per worker process (like
+the pool metrics in app.pooling). GET /health/provisioning reports them as
+JSON and GET /metrics in the Prometheus text format, so each worker can be
+scraped on its own.
+"""
+from collections import deque
+from threading import Lock
+import math
+
+# Upper bounds (ms) of the default histogram buckets, from a fast template
+# clone up to a slow DDL run on a busy server
+DEFAULT_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 120000)
+
+
+class _Series:
+    """Observations of one label combination."""
+
+    def __init__(self, buckets: tuple, window: int):
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=window)
+
+
+class Histogram:
+    """
+    Histogram of observed values per label combination.
+
+    Bucket counts are cumulative (Prometheus "le" semantics). p50 and p95
+    are computed from the latest window observations of each series.
+    """
+
+    def __init__(self, name: str, description: str, buckets: tuple = DEFAULT_BUCKETS_MS, window: int = 1000):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self.window = window
+        self._series = {}  # sorted label items -> _Series
+        self._lock = Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        """Record one value for the given labels."""
+        key = tuple(sorted((name, str(label)) for name, label in labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(self.buckets, self.window)
+
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series.bucket_counts[i] += 1
+            series.count += 1
+            series.sum += value
+            series.max = max(series.max, value)
+            series.recent.append(value)
+
+    def snapshot(self) -> list:
+        """One dict per label combination with count, sum, avg, p50, p95, max and buckets."""
+        with self._lock:
+            result = []
+            for key, series in sorted(self._series.items()):
+                recent = sorted(series.recent)
+                result.append({
+                    "labels": dict(key),
+                    "count": series.count,
+                    "sum": round(series.sum, 3),
+                    "avg": round(series.sum / series.count, 3),
+                    "p50": round(_quantile(recent, 0.5), 3),
+                    "p95": round(_quantile(recent, 0.95), 3),
+                    "max": round(series.max, 3),
+                    "buckets": {str(bound): count for bound, count in zip(self.buckets, series.bucket_counts)}
+                })
+            return result
+
+    def render_prometheus(self) -> str:
+        """The histogram in the Prometheus text exposition format."""
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                labels = [f'{name}="{_escape(value)}"' for name, value in key]
+                bounds = [str(bound) for bound in self.buckets] + ["+Inf"]
+                counts = series.bucket_counts + [series.count]
+                for bound, count in zip(bounds, counts):
+                    bucket_labels = ",".join(labels + [f'le="{bound}"'])
+                    lines.append(f"{self.name}_bucket{{{bucket_labels}}} {count}")
+                label_text = "{" + ",".join(labels) + "}" if labels else ""
+                lines.append(f"{self.name}_sum{label_text} {series.sum}")
+                lines.append(f"{self.name}_count{label_text} {series.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _quantile(ordered: list, q: float) -> float:
+    """Nearest-rank quantile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[max(math.ceil(len(ordered) * q) - 1, 0)]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# All histograms of this process by name
+histograms = {}
+
+
+def histogram(name: str, description: str, buckets: tuple = DEFAULT_BUCKETS_MS) -> Histogram:
+    """Get the histogram registered under name, creating it on first use."""
+    if name not in histograms:
+        histograms[name] = Histogram(name, description, buckets)
+    return histograms[name]
+
+
+def render_prometheus() -> str:
+    """Every registered histogram in the Prometheus text exposition format."""
+    return "".join(h.render_prometheus() for h in histograms.values())
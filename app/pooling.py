@@ -0,0 +1,146 @@
+"""Connection pool settings and instrumentation for the super admin engines.
+
+Every engine built here uses a QueuePool subclass that times each
+checkout. The counters are kept on a per-engine pool class, so they
+survive the pool being recreated by engine.dispose(), and are reported by
+GET /health/pools.
+"""
+from collections import deque
+from threading import Lock
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+import math
+import time
+
+from app.config import settings
+
+
+class PoolMetrics:
+    """
+    Checkout counters and latency for one engine's pool.
+
+    A checkout "waits" when no idle connection was available and the pool
+    could not open an overflow connection, i.e. the pool was exhausted.
+    """
+
+    def __init__(self, name: str, window: int = 1000):
+        self.name = name
+        self._lock = Lock()
+        self._recent = deque(maxlen=window)  # latest checkout latencies (seconds)
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record_checkout(self, seconds: float, waited: bool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.waits += waited
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+            self._recent.append(seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+            self.waits += 1
+
+    def snapshot(self) -> dict:
+        """Counters with checkout latency in milliseconds."""
+        with self._lock:
+            recent = sorted(self._recent)
+            return {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "checkout_avg_ms": round(self.total_seconds / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "checkout_p95_ms": round(recent[math.ceil(len(recent) * 0.95) - 1] * 1000, 3) if recent else 0.0,
+                "checkout_max_ms": round(self.max_seconds * 1000, 3)
+            }
+
+
+class _InstrumentedPoolMixin:
+    """Times _do_get(); subclasses carry a PoolMetrics in the metrics attribute."""
+
+    metrics = None
+
+    def _do_get(self):
+        exhausted = (
+            self.checkedin() == 0
+            and self._max_overflow > -1
+            and self.overflow() >= self._max_overflow
+        )
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(time.perf_counter() - start, exhausted)
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+# Pools of the engines built with pool_options(), by name
+instrumented_pools = {}
+
+
+def pool_options(name: str, is_async: bool = False) -> dict:
+    """
+    create_engine()/create_async_engine() keyword arguments for a named engine.
+
+    Applies the DB_POOL_* settings and an instrumented pool class whose
+    metrics are registered under name.
+
+    Args:
+        name: Engine name used in the pool statistics
+        is_async: True for create_async_engine()
+
+    Returns:
+        dict of engine keyword arguments
+    """
+    base = InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool
+    poolclass = type(f"{base.__name__}_{name}", (base,), {"metrics": PoolMetrics(name)})
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING
+    }
+
+
+def register_engine(name: str, engine) -> None:
+    """Report engine's pool in pool_stats() under name."""
+    instrumented_pools[name] = engine
+
+
+def pool_stats() -> dict:
+    """
+    Live statistics of every registered engine's pool.
+
+    Returns:
+        dict of engine name -> pool size, checked in/out connections,
+        overflow, and the checkout counters of PoolMetrics
+    """
+    stats = {}
+    for name, engine in instrumented_pools.items():
+        pool = engine.pool
+        stats[name] = {
+            "pool_size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            **pool.metrics.snapshot()
+        }
+    return stats
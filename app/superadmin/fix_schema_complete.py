@@ -1,6 +1,6 @@
 """Complete schema fix for existing tenant databases - ALL 40+ tables."""
-from sqlalchemy import create_engine, text
-from app.config import settings
+from sqlalchemy import text
+from app.database import get_tenant_engine
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,12 +19,8 @@ def fix_tenant_schema_complete(db_name: str, tenant_id: int) -> dict:
         dict with status and message
     """
     try:
-        # Construct database URL for the tenant
-        db_url = f"{settings.POSTGRES_SERVER_URL.rsplit('/', 1)[0]}/{db_name}"
-        db_url = db_url.replace('/postgres', f'/{db_name}')
-        
-        # Create engine
-        engine = create_engine(db_url, pool_pre_ping=True)
+        # Shared engine for the tenant database
+        engine = get_tenant_engine(db_name)
         
         with engine.connect() as connection:
             
@@ -0,0 +1,580 @@
+"""Background provisioning jobs.
+
+POST /super-admin/jobs/create-tenant stores a job in provisioning_jobs and
+returns right away; a bounded pool of worker tasks in each process runs
+the provisioning pipeline (app.superadmin.provisioning) and writes the
+progress of every step back to the job row, where GET /super-admin/jobs/{id}
+reads it from any worker.
+
+The initial admin password of a finished job is kept in the row, encrypted
+with PROVISIONING_JOB_PASSWORD_KEYS (Fernet), until it is collected, exactly
+once, with POST /super-admin/jobs/{id}/initial-password; it is only
+decrypted there. A sweeper task in every process deletes the passwords not
+collected within PROVISIONING_JOB_PASSWORD_TTL_SECONDS, every
+PROVISIONING_JOB_SWEEP_SECONDS.
+
+Fleet migrations (POST /super-admin/jobs/migrate-tenants) run through the
+same queue; their progress counters are written to the job's result as
+each tenant is done.
+
+Jobs still queued when a process stops are picked up by the next process
+that starts; a job is claimed with a conditional UPDATE, so only one worker
+runs it. The claiming process is recorded as the job's worker_id, and it
+renews the job's heartbeat_at every PROVISIONING_JOB_HEARTBEAT_SECONDS.
+A running job whose heartbeat is older than PROVISIONING_JOB_STALE_SECONDS
+lost its process; any process marks it failed ("Interrupted during step
+X"), and a tenant it left in status 'provisioning' is marked 'failed' so
+that POST /super-admin/tenants/{id}/resume continues it. A job cancelled by
+a clean shutdown is handled the same way right away.
+"""
+from cryptography.fernet import Fernet, MultiFernet, InvalidToken
+from datetime import datetime, timedelta
+from functools import lru_cache
+from sqlalchemy import select, update, and_, or_
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.superadmin.models import Tenant
+from app.superadmin.provisioning_jobs_model import ProvisioningJob
+from app.superadmin.service import mark_tenant_status
+from app.superadmin.provisioning import StepRecorder, ProvisioningError, provision_tenant
+from app.hrms_provisioning.fleet_migrations import migrate_tenant_fleet
+import asyncio
+import logging
+import os
+import socket
+import uuid
+
+logger = logging.getLogger(__name__)
+
+JOB_TYPE_CREATE_TENANT = "create_tenant"
+JOB_TYPE_MIGRATE_TENANTS = "migrate_tenants"
+
+
+class JobQueueFull(Exception):
+    """The job queue of this process is full."""
+
+
+class PasswordKeyMissing(Exception):
+    """PROVISIONING_JOB_PASSWORD_KEYS is not set, so initial passwords cannot be stored."""
+
+
+@lru_cache(maxsize=1)
+def _password_cipher() -> MultiFernet:
+    keys = [key.strip() for key in settings.PROVISIONING_JOB_PASSWORD_KEYS.split(",") if key.strip()]
+    if not keys:
+        raise PasswordKeyMissing()
+    return MultiFernet([Fernet(key) for key in keys])
+
+
+def encrypt_initial_password(password: str) -> str:
+    """Encrypt an initial admin password for storage in provisioning_jobs."""
+    return _password_cipher().encrypt(password.encode()).decode()
+
+
+def decrypt_initial_password(token: str) -> str:
+    """
+    Decrypt an initial admin password stored by encrypt_initial_password.
+
+    Raises:
+        InvalidToken: If none of the configured keys encrypted it
+    """
+    return _password_cipher().decrypt(token.encode()).decode()
+
+
+def _password_cutoff() -> datetime:
+    """Jobs that finished before this no longer hand out their initial password."""
+    return datetime.utcnow() - timedelta(seconds=settings.PROVISIONING_JOB_PASSWORD_TTL_SECONDS)
+
+
+def _interrupted_step(steps: list) -> str:
+    """Step a create-tenant job was running (or last ran) when it was interrupted."""
+    started = [entry["name"] for entry in steps or [] if entry["status"] not in ("pending", "skipped")]
+    return started[-1] if started else None
+
+
+def _fail_running_steps(steps: list) -> list:
+    return [
+        dict(entry, status="failed", error="Interrupted") if entry["status"] == "running" else entry
+        for entry in steps or []
+    ]
+
+
+async def _release_interrupted_tenant(tenant_id: int) -> None:
+    """Mark a tenant left in status 'provisioning' by an interrupted job as failed (resumable)."""
+    try:
+        async with AsyncSessionLocal() as db:
+            tenant = await db.get(Tenant, tenant_id)
+            if tenant is not None and tenant.status == "provisioning":
+                await mark_tenant_status(db, tenant, "failed")
+                logger.info(f"Tenant {tenant_id} marked failed at step {tenant.provisioning_step}, resume it with POST /super-admin/tenants/{tenant_id}/resume")
+    except Exception as e:
+        logger.error(f"Failed to mark interrupted tenant {tenant_id} as failed: {str(e)}")
+
+
+def job_to_dict(job: ProvisioningJob) -> dict:
+    """Public view of a job (never includes the initial password)."""
+    duration_ms = None
+    if job.started_at and job.finished_at:
+        duration_ms = round((job.finished_at - job.started_at).total_seconds() * 1000, 1)
+
+    return {
+        "job_id": job.id,
+        "job_type": job.job_type,
+        "status": job.status,
+        "tenant_id": job.tenant_id,
+        "steps": job.steps or [],
+        "result": job.result,
+        "error": job.error,
+        "worker_id": job.worker_id,
+        "heartbeat_at": job.heartbeat_at,
+        "initial_password_available": job.initial_password_encrypted is not None,
+        "password_collected_at": job.password_collected_at,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        "duration_ms": duration_ms
+    }
+
+
+class ProvisioningJobQueue:
+    """
+    Bounded pool of asyncio worker tasks running provisioning jobs.
+
+    The blocking parts of a job still run in the blocking executor; the
+    worker count caps how many tenants one process provisions at a time.
+    """
+
+    def __init__(self, workers: int, queue_size: int, sweep_interval: float,
+                 heartbeat_interval: float, stale_after: float):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.sweep_interval = sweep_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._queue = None
+        self._tasks = []
+        self._background = []
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+
+    async def start(self) -> None:
+        """
+        Start the worker tasks, the password sweeper and the heartbeat.
+
+        Fails the jobs left running by processes that died, and picks up
+        jobs left queued by a previous process.
+        """
+        if self._tasks:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._background = [asyncio.create_task(self._sweep()), asyncio.create_task(self._heartbeat())]
+
+        await self.fail_stale_jobs()
+
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(ProvisioningJob.id)
+                .where(ProvisioningJob.status == "queued")
+                .order_by(ProvisioningJob.created_at)
+                .limit(self.queue_size)
+            )
+            pending = result.scalars().all()
+
+        for job_id in pending:
+            self._queue.put_nowait(job_id)
+        if pending:
+            logger.info(f"Resuming {len(pending)} queued provisioning jobs")
+
+    async def stop(self) -> None:
+        """Cancel the worker and background tasks. Jobs that did not start stay queued in the database."""
+        tasks = self._tasks + self._background
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        self._background = []
+        self._queue = None
+
+    async def submit_create_tenant(self, db, name: str, company_name: str, admin_email: str) -> ProvisioningJob:
+        """
+        Store a create-tenant job and queue it.
+
+        Args:
+            db: Database session for super_admin_db
+            name: Tenant name
+            company_name: Company name (used for login)
+            admin_email: Email of the initial admin user
+
+        Returns:
+            The queued ProvisioningJob
+
+        Raises:
+            JobQueueFull: If this process already has queue_size jobs waiting
+            PasswordKeyMissing: If no key to encrypt the initial password is configured
+        """
+        _password_cipher()
+        return await self._submit(
+            db,
+            JOB_TYPE_CREATE_TENANT,
+            params={"name": name, "company_name": company_name, "admin_email": admin_email},
+            steps=StepRecorder().steps
+        )
+
+    async def submit_migrate_tenants(self, db, target: str, concurrency: int, on_failure: str) -> ProvisioningJob:
+        """
+        Store a fleet migration job and queue it.
+
+        Args:
+            db: Database session for super_admin_db
+            target: Revision to upgrade the tenant databases to
+            concurrency: Tenants handled at the same time (None for the default)
+            on_failure: "stop" or "continue" (see migrate_tenant_fleet)
+
+        Returns:
+            The queued ProvisioningJob
+
+        Raises:
+            JobQueueFull: If this process already has queue_size jobs waiting
+        """
+        return await self._submit(
+            db,
+            JOB_TYPE_MIGRATE_TENANTS,
+            params={"target": target, "concurrency": concurrency, "on_failure": on_failure},
+            steps=[]
+        )
+
+    async def _submit(self, db, job_type: str, params: dict, steps: list) -> ProvisioningJob:
+        if self._queue is None or self._queue.full():
+            raise JobQueueFull()
+
+        job = ProvisioningJob(
+            id=uuid.uuid4().hex,
+            job_type=job_type,
+            status="queued",
+            params=params,
+            steps=steps
+        )
+        db.add(job)
+        await db.commit()
+
+        self._queue.put_nowait(job.id)
+        return job
+
+    def stats(self) -> dict:
+        """Return queue state of this process for monitoring."""
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "queue_size": self.queue_size,
+            "worker_id": self.worker_id,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed
+        }
+
+    async def _sweep(self) -> None:
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    expired = await expire_initial_passwords(db)
+                if expired:
+                    logger.info(f"Deleted {expired} expired initial passwords of provisioning jobs")
+            except Exception as e:
+                logger.error(f"Failed to delete expired initial passwords: {str(e)}")
+            await asyncio.sleep(self.sweep_interval)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                if self.running:
+                    async with AsyncSessionLocal() as db:
+                        await db.execute(
+                            update(ProvisioningJob)
+                            .where(ProvisioningJob.status == "running", ProvisioningJob.worker_id == self.worker_id)
+                            .values(heartbeat_at=datetime.utcnow())
+                        )
+                        await db.commit()
+                await self.fail_stale_jobs()
+            except Exception as e:
+                logger.error(f"Provisioning job heartbeat failed: {str(e)}")
+
+    async def fail_stale_jobs(self) -> int:
+        """
+        Mark running jobs whose process died as failed.
+
+        A job is stale when its heartbeat (or, for jobs claimed before
+        heartbeats were recorded, its start) is older than stale_after.
+        Tenants those jobs left in status 'provisioning' are marked
+        'failed', so they can be resumed.
+
+        Returns:
+            Number of jobs marked failed
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=self.stale_after)
+        stale = and_(
+            ProvisioningJob.status == "running",
+            or_(
+                ProvisioningJob.heartbeat_at < cutoff,
+                and_(ProvisioningJob.heartbeat_at.is_(None), ProvisioningJob.started_at < cutoff)
+            )
+        )
+
+        failed = 0
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(ProvisioningJob).where(stale))
+            for job in result.scalars().all():
+                step = _interrupted_step(job.steps) if job.job_type == JOB_TYPE_CREATE_TENANT else None
+                error = f"Interrupted during step {step}" if step else "Interrupted"
+                # Conditional, so a job is failed (and its tenant released) by one process only
+                marked = await db.execute(
+                    update(ProvisioningJob)
+                    .where(ProvisioningJob.id == job.id, stale)
+                    .values(
+                        status="failed",
+                        error=f"{error} (worker {job.worker_id or 'unknown'} stopped responding)",
+                        steps=_fail_running_steps(job.steps),
+                        finished_at=datetime.utcnow()
+                    )
+                )
+                await db.commit()
+                if not marked.rowcount:
+                    continue
+
+                failed += 1
+                self.failed += 1
+                logger.warning(f"Provisioning job {job.id} of worker {job.worker_id} is stale: {error}")
+                if job.job_type == JOB_TYPE_CREATE_TENANT and job.tenant_id is not None:
+                    await _release_interrupted_tenant(job.tenant_id)
+
+        return failed
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Provisioning job {job_id} crashed: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        """Claim a queued job, run it and store its outcome."""
+        async with AsyncSessionLocal() as db:
+            claimed = await db.execute(
+                update(ProvisioningJob)
+                .where(ProvisioningJob.id == job_id, ProvisioningJob.status == "queued")
+                .values(
+                    status="running",
+                    started_at=datetime.utcnow(),
+                    worker_id=self.worker_id,
+                    heartbeat_at=datetime.utcnow()
+                )
+                .returning(ProvisioningJob.job_type, ProvisioningJob.params)
+            )
+            row = claimed.first()
+            await db.commit()
+
+        if row is None:
+            # Taken by another worker (or no longer queued)
+            return
+
+        job_type, params = row
+        if job_type == JOB_TYPE_MIGRATE_TENANTS:
+            await self._run_migrate_tenants(job_id, params)
+        else:
+            await self._run_create_tenant(job_id, params)
+
+    async def _run_create_tenant(self, job_id: str, params: dict) -> None:
+        logger.info(f"Running provisioning job {job_id} for {params['company_name']}")
+        self.running += 1
+        recorder = StepRecorder(on_change=lambda recorder: self._save_progress(job_id, recorder))
+        values = {}
+        interrupted = False
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await provision_tenant(db, recorder=recorder, **params)
+
+            initial_password = encrypt_initial_password(result.pop("initial_password"))
+            values = {"status": "succeeded", "result": result, "initial_password_encrypted": initial_password}
+            self.completed += 1
+        except ProvisioningError as e:
+            values = {"status": "failed", "error": e.detail}
+            self.failed += 1
+        except asyncio.CancelledError:
+            values = {"status": "failed", "error": f"Interrupted during step {recorder.current_step}"}
+            interrupted = True
+            self.failed += 1
+            raise
+        except Exception as e:
+            logger.error(f"Provisioning job {job_id} failed: {str(e)}")
+            values = {"status": "failed", "error": f"Failed to create tenant: {str(e)}"}
+            self.failed += 1
+        finally:
+            self.running -= 1
+            if values:
+                await self._finish(job_id, dict(values, steps=recorder.steps, tenant_id=recorder.tenant_id))
+            if interrupted and recorder.tenant_id is not None:
+                await _release_interrupted_tenant(recorder.tenant_id)
+
+    async def _run_migrate_tenants(self, job_id: str, params: dict) -> None:
+        logger.info(f"Running fleet migration job {job_id} to {params['target']}")
+        self.running += 1
+        values = {}
+        try:
+            summary = await migrate_tenant_fleet(
+                on_progress=lambda progress: self._save_result(job_id, progress),
+                **params
+            )
+            if summary["failed"]:
+                values = {
+                    "status": "failed",
+                    "result": summary,
+                    "error": f"Migration failed for {summary['failed']} of {summary['total']} tenants"
+                }
+                self.failed += 1
+            else:
+                values = {"status": "succeeded", "result": summary}
+                self.completed += 1
+        except asyncio.CancelledError:
+            values = {"status": "failed", "error": "Interrupted"}
+            self.failed += 1
+            raise
+        except Exception as e:
+            logger.error(f"Fleet migration job {job_id} failed: {str(e)}")
+            values = {"status": "failed", "error": f"Failed to migrate tenants: {str(e)}"}
+            self.failed += 1
+        finally:
+            self.running -= 1
+            if values:
+                await self._finish(job_id, values)
+
+    async def _save_progress(self, job_id: str, recorder: StepRecorder) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(ProvisioningJob)
+                .where(ProvisioningJob.id == job_id)
+                .values(steps=recorder.steps, tenant_id=recorder.tenant_id)
+            )
+            await db.commit()
+
+    async def _save_result(self, job_id: str, result: dict) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(ProvisioningJob)
+                .where(ProvisioningJob.id == job_id)
+                .values(result=result)
+            )
+            await db.commit()
+
+    async def _finish(self, job_id: str, values: dict) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(ProvisioningJob)
+                .where(ProvisioningJob.id == job_id)
+                .values(finished_at=datetime.utcnow(), **values)
+            )
+            await db.commit()
+        logger.info(f"Provisioning job {job_id} {values['status']}")
+
+
+provisioning_jobs = ProvisioningJobQueue(
+    workers=settings.PROVISIONING_JOB_WORKERS,
+    queue_size=settings.PROVISIONING_JOB_QUEUE_SIZE,
+    sweep_interval=settings.PROVISIONING_JOB_SWEEP_SECONDS,
+    heartbeat_interval=settings.PROVISIONING_JOB_HEARTBEAT_SECONDS,
+    stale_after=settings.PROVISIONING_JOB_STALE_SECONDS
+)
+
+
+async def expire_initial_passwords(db) -> int:
+    """
+    Delete the initial passwords not collected within PROVISIONING_JOB_PASSWORD_TTL_SECONDS.
+
+    Args:
+        db: Database session for super_admin_db
+
+    Returns:
+        Number of passwords deleted
+    """
+    result = await db.execute(
+        update(ProvisioningJob)
+        .where(
+            ProvisioningJob.initial_password_encrypted.is_not(None),
+            ProvisioningJob.finished_at < _password_cutoff()
+        )
+        .values(initial_password_encrypted=None)
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def get_job(db, job_id: str) -> ProvisioningJob:
+    """
+    Load a job, clearing its initial password if it expired since the last sweep.
+
+    Args:
+        db: Database session for super_admin_db
+        job_id: Job ID
+
+    Returns:
+        The ProvisioningJob, or None if not found
+    """
+    job = await db.get(ProvisioningJob, job_id)
+    if job is not None and job.initial_password_encrypted is not None and job.finished_at < _password_cutoff():
+        job.initial_password_encrypted = None
+        await db.commit()
+    return job
+
+
+async def collect_initial_password(db, job_id: str) -> str:
+    """
+    Hand out the initial admin password of a finished job, exactly once.
+
+    The row is locked while the encrypted password is read and cleared, so
+    concurrent callers (on any worker) cannot both receive it. It is
+    decrypted only here.
+
+    Args:
+        db: Database session for super_admin_db
+        job_id: Job ID
+
+    Returns:
+        The plaintext password, or None if the job has none (not finished,
+        failed, already collected, expired or encrypted with a key that is
+        no longer configured)
+    """
+    result = await db.execute(
+        select(ProvisioningJob.initial_password_encrypted)
+        .where(
+            ProvisioningJob.id == job_id,
+            ProvisioningJob.initial_password_encrypted.is_not(None),
+            ProvisioningJob.finished_at >= _password_cutoff()
+        )
+        .with_for_update()
+    )
+    encrypted = result.scalar()
+    initial_password = None
+    if encrypted is not None:
+        try:
+            initial_password = decrypt_initial_password(encrypted)
+        except (InvalidToken, PasswordKeyMissing):
+            logger.error(f"Initial password of job {job_id} cannot be decrypted with PROVISIONING_JOB_PASSWORD_KEYS")
+        await db.execute(
+            update(ProvisioningJob)
+            .where(ProvisioningJob.id == job_id)
+            .values(initial_password_encrypted=None, password_collected_at=datetime.utcnow())
+        )
+    await db.commit()
+    return initial_password
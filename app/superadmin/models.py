@@ -1,5 +1,5 @@
 """SQLAlchemy models for Super Admin Service."""
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index, JSON, func, text
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
@@ -22,6 +22,34 @@ class Tenant(SuperAdminBase):
     admin_email = Column(String, nullable=False, index=True)
     status = Column(String, nullable=False, default="active")
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=func.now())
+    # Row version, bumped by the ORM on every UPDATE; used for lookup ETags
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    # Per-step duration breakdown of the provisioning run (ms)
+    provisioning_timings = Column(JSON, nullable=True)
+    # Provisioning step running or failed (NULL once provisioning completed)
+    provisioning_step = Column(String, nullable=True)
+    # tenant_migrations revision(s) of the tenant database, comma-separated
+    # (recorded by the fleet migration), and when it was last checked
+    schema_revision = Column(String, nullable=True)
+    schema_checked_at = Column(DateTime, nullable=True)
+    
+    # Case-insensitive login lookups always filter on status = 'active', so the
+    # lower() indexes are partial and only cover resolvable tenants.
+    __table_args__ = (
+        Index(
+            "ix_tenants_company_name_lower_active",
+            func.lower(company_name),
+            postgresql_where=text("status = 'active'")
+        ),
+        Index(
+            "ix_tenants_admin_email_lower_active",
+            func.lower(admin_email),
+            postgresql_where=text("status = 'active'")
+        ),
+    )
+    
+    __mapper_args__ = {"version_id_col": version}
     
     def __repr__(self):
         return f"<Tenant(id={self.id}, name='{self.name}', db_name='{self.db_name}')>"
@@ -0,0 +1,489 @@
+"""Tenant provisioning pipeline.
+
+The steps behind tenant creation: tenant record, database, schema, admin
+password hash, admin seed. POST /super-admin/create-tenant runs the
+pipeline inside the request; the provisioning job queue
+(app.superadmin.jobs) runs it in the background and reports the progress
+of every step while it runs.
+
+Every step is timed with a monotonic clock. Durations go to the
+provisioning_step_duration_ms histogram (labelled by step, database host
+and outcome, see app.metrics), into the create-tenant response and into
+the tenant's provisioning_timings column.
+
+Creations may run concurrently on any number of workers: database names
+carry a random suffix, and the tenant record is only inserted while
+holding a transaction-level advisory lock on the normalized company name,
+after checking that no tenant has that name. A conflicting creation fails
+with TenantConflictError before any database is created.
+"""
+from contextlib import asynccontextmanager
+from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.concurrency import run_blocking
+from app.database import AsyncSessionLocal
+from app.config import settings
+from app.superadmin.service import (
+    create_tenant_record,
+    mark_tenant_status,
+    save_provisioning_timings,
+    set_provisioning_step,
+    lock_company_name,
+    company_name_taken
+)
+from app.hrms_provisioning.database_creator import create_database, database_exists
+from app.hrms_provisioning.template_db import create_database_from_template, apply_tenant_settings
+from app.hrms_provisioning.spare_pool import claim_spare_database, spare_pool_refiller
+from app.hrms_provisioning.seed_admin import seed_initial_admin
+from app.superadmin.create_perfect_schema import create_perfect_tenant_schema
+from app.hashing import hash_password_async
+from app.utils import generate_secure_password
+from app.metrics import histogram
+import asyncio
+import logging
+import re
+import time
+import traceback
+import uuid
+
+logger = logging.getLogger(__name__)
+
+PROVISIONING_STEPS = ("create_record", "create_database", "create_schema", "hash_password", "seed_admin")
+
+step_duration = histogram(
+    "provisioning_step_duration_ms",
+    "Duration of tenant provisioning steps in milliseconds"
+)
+total_duration = histogram(
+    "provisioning_duration_ms",
+    "Duration of tenant provisioning (all steps) in milliseconds"
+)
+
+
+class ProvisioningError(Exception):
+    """
+    A provisioning step failed.
+
+    Attributes:
+        step: Name of the step that failed
+        detail: Error message reported to the client
+    """
+
+    def __init__(self, step: str, detail: str):
+        super().__init__(detail)
+        self.step = step
+        self.detail = detail
+
+
+class TenantConflictError(ProvisioningError):
+    """The company name is taken, or a tenant with that name is being created right now."""
+
+
+class StepRecorder:
+    """
+    Records the status and timing of each provisioning step.
+
+    Attributes:
+        steps: One dict per step with name, status (pending, skipped,
+            running, succeeded, failed), started_at, finished_at, duration_ms and error
+        tenant_id: ID of the tenant record, once created
+        resumed_from: Step a resumed run started at (earlier steps are
+            "skipped"), None for a full run
+        db_host: Database host of the tenant (histogram label)
+        on_change: Optional async callback awaited with the recorder whenever
+            a step starts or finishes
+    """
+
+    def __init__(self, on_change=None):
+        self.steps = [
+            {
+                "name": name,
+                "status": "pending",
+                "started_at": None,
+                "finished_at": None,
+                "duration_ms": None,
+                "error": None
+            }
+            for name in PROVISIONING_STEPS
+        ]
+        self.tenant_id = None
+        self.db_host = settings.DB_HOST
+        self.resumed_from = None
+        self.on_change = on_change
+
+    @asynccontextmanager
+    async def step(self, name: str):
+        """Time the wrapped block as step name; yields the step dict for extra details."""
+        entry = next(entry for entry in self.steps if entry["name"] == name)
+        entry["status"] = "running"
+        entry["started_at"] = datetime.utcnow().isoformat()
+        started = time.perf_counter()
+        await self._changed()
+
+        try:
+            yield entry
+            entry["status"] = "succeeded"
+        except BaseException as e:
+            entry["status"] = "failed"
+            entry["error"] = str(e)
+            raise
+        finally:
+            entry["finished_at"] = datetime.utcnow().isoformat()
+            entry["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            step_duration.observe(entry["duration_ms"], step=name, db_host=self.db_host, status=entry["status"])
+            await self._changed()
+
+    def timings(self) -> dict:
+        """Per-step duration breakdown of the steps that ran (ms)."""
+        finished = [entry for entry in self.steps if entry["duration_ms"] is not None]
+        return {
+            "steps_ms": {entry["name"]: entry["duration_ms"] for entry in finished},
+            "total_ms": round(sum(entry["duration_ms"] for entry in finished), 1),
+            "database_mode": next((entry["mode"] for entry in self.steps if entry.get("mode")), None),
+            "db_host": self.db_host,
+            "resumed_from": self.resumed_from
+        }
+
+    @property
+    def current_step(self) -> str:
+        """Name of the step that is running (or last ran)."""
+        started = [entry["name"] for entry in self.steps if entry["status"] not in ("pending", "skipped")]
+        return started[-1] if started else PROVISIONING_STEPS[0]
+
+    async def _changed(self) -> None:
+        if self.on_change is None:
+            return
+        try:
+            await self.on_change(self)
+        except Exception as e:
+            # Progress reporting must not fail the provisioning itself
+            logger.error(f"Failed to report provisioning progress: {str(e)}")
+
+
+def generate_db_name(name: str) -> str:
+    """
+    Database name for a new tenant: tenant_<name slug>_<random hex>.
+
+    The random suffix keeps names unique across concurrent creations (even
+    of tenants with the same name), and the result stays within
+    PostgreSQL's 63-byte identifier limit.
+    """
+    slug = re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")[:40] or "tenant"
+    return f"tenant_{slug}_{uuid.uuid4().hex[:12]}"
+
+
+def resume_step(tenant) -> str:
+    """
+    Step a failed or interrupted provisioning of tenant continues from.
+
+    A failed seed restarts at hash_password, since the new run needs a new
+    initial password. Tenants without a recorded step (provisioned before
+    steps were recorded) restart at create_database; every step from there
+    on is idempotent.
+    """
+    step = tenant.provisioning_step
+    if step == "seed_admin":
+        return "hash_password"
+    if step not in PROVISIONING_STEPS or step == "create_record":
+        return "create_database"
+    return step
+
+
+async def provision_tenant(
+    db: AsyncSession,
+    name: str,
+    company_name: str,
+    admin_email: str,
+    recorder: StepRecorder = None
+) -> dict:
+    """
+    Create a tenant: record in super_admin_db, database, schema and admin user.
+
+    The tenant is created with status 'provisioning' and only becomes
+    active (resolvable) when every step succeeded. On failure the tenant
+    record is kept, marked schema_failed, seed_failed or failed, and keeps
+    the failed step in provisioning_step for resume_provisioning.
+
+    Args:
+        db: Database session for super_admin_db
+        name: Tenant name
+        company_name: Company name (used for login)
+        admin_email: Email of the initial admin user
+        recorder: Optional StepRecorder tracking the progress
+
+    Returns:
+        dict with tenant_id, tenant_db, admin_email, the plaintext
+        initial_password (not stored anywhere by the pipeline) and the
+        provisioning_timings breakdown
+
+    Raises:
+        TenantConflictError: If the company name is taken or being created
+            concurrently (nothing was created)
+        ProvisioningError: If any step fails
+    """
+    recorder = recorder or StepRecorder()
+    try:
+        # Generate unique database name
+        db_name = generate_db_name(name)
+
+        # Step 1: Create tenant record in super_admin_db FIRST to get tenant_id
+        async with recorder.step("create_record"):
+            logger.info(f"Creating tenant record for: {name} (Company: {company_name})")
+            # Lock and check the company name in the transaction that inserts
+            # the record; the lock is released by its commit
+            if not await lock_company_name(db, company_name):
+                raise TenantConflictError(
+                    "create_record",
+                    f"A tenant for company '{company_name}' is already being created"
+                )
+            if await company_name_taken(db, company_name):
+                raise TenantConflictError(
+                    "create_record",
+                    f"A tenant with company name '{company_name}' already exists"
+                )
+            tenant = await create_tenant_record(
+                db=db,
+                name=name,
+                company_name=company_name,
+                db_name=db_name,
+                admin_email=admin_email,
+                status="provisioning"
+            )
+            recorder.tenant_id = tenant.id
+            recorder.db_host = tenant.db_host
+            logger.info(f"Tenant record created with ID: {tenant.id}")
+    except TenantConflictError as e:
+        logger.warning(f"Tenant creation rejected: {e.detail}")
+        await db.rollback()
+        total_duration.observe(recorder.timings()["total_ms"], db_host=recorder.db_host, status="conflict")
+        raise
+    except IntegrityError as e:
+        # Unique company_name or db_name, e.g. from a creation that did not take the lock
+        logger.warning(f"Tenant record conflicts with an existing tenant: {str(e)}")
+        await db.rollback()
+        total_duration.observe(recorder.timings()["total_ms"], db_host=recorder.db_host, status="conflict")
+        raise TenantConflictError("create_record", f"A tenant with company name '{company_name}' already exists")
+    except Exception as e:
+        logger.error(f"Failed to create tenant record: {str(e)}")
+        total_duration.observe(recorder.timings()["total_ms"], db_host=recorder.db_host, status="failed")
+        raise ProvisioningError("create_record", f"Failed to create tenant: {str(e)}")
+
+    return await _run_steps(db, tenant, recorder, "create_database")
+
+
+async def resume_provisioning(db: AsyncSession, tenant, recorder: StepRecorder = None) -> dict:
+    """
+    Continue a failed or interrupted provisioning from its recorded step.
+
+    Steps before that one are skipped; the steps that run are idempotent
+    (an existing database is reused, the admin user is updated instead of
+    inserted again). A tenant whose seed failed costs a password hash and
+    one INSERT.
+
+    Args:
+        db: Database session for super_admin_db
+        tenant: Tenant in a resumable status (failed, schema_failed,
+            seed_failed, or provisioning if the previous run was interrupted)
+        recorder: Optional StepRecorder tracking the progress
+
+    Returns:
+        Same dict as provision_tenant, with a new initial_password
+
+    Raises:
+        sqlalchemy.orm.exc.StaleDataError: If the tenant was changed concurrently
+            (e.g. another resume claimed it first)
+        ProvisioningError: If any step fails
+    """
+    recorder = recorder or StepRecorder()
+    recorder.tenant_id = tenant.id
+    recorder.db_host = tenant.db_host
+    start = resume_step(tenant)
+    previous_timings = tenant.provisioning_timings or {}
+
+    # Claim the tenant; the version check makes a concurrent resume fail
+    await mark_tenant_status(db, tenant, "provisioning")
+    logger.info(f"Resuming provisioning of tenant {tenant.id} at step {start}")
+
+    recorder.resumed_from = start
+    for entry in recorder.steps[:PROVISIONING_STEPS.index(start)]:
+        entry["status"] = "skipped"
+        if entry["name"] == "create_database":
+            entry["mode"] = previous_timings.get("database_mode")
+
+    return await _run_steps(db, tenant, recorder, start)
+
+
+async def _run_steps(db: AsyncSession, tenant, recorder: StepRecorder, start: str) -> dict:
+    """Run the provisioning steps from start on for an existing tenant record."""
+    tenant_id = tenant.id
+    db_name = tenant.db_name
+    admin_email = tenant.admin_email
+    steps = PROVISIONING_STEPS[PROVISIONING_STEPS.index(start):]
+    resumed = recorder.resumed_from is not None
+    outcome = "succeeded"
+    try:
+        # Step 2: Get the database: a spare from the warm pool, a clone of the
+        # schema template, or a new empty database (in that order, as enabled)
+        if "create_database" in steps:
+            await set_provisioning_step(db, tenant, "create_database")
+            async with recorder.step("create_database") as step:
+                mode = None
+                if resumed and await run_blocking(database_exists, db_name):
+                    # Created by the interrupted run; the schema is rebuilt below
+                    mode = "existing"
+
+                if mode is None and settings.TENANT_SPARE_POOL_SIZE > 0:
+                    try:
+                        if await run_blocking(claim_spare_database, db_name):
+                            mode = "spare"
+                    except Exception as spare_error:
+                        logger.error(f"Claiming a spare database failed: {str(spare_error)}")
+                    spare_pool_refiller.wake()
+
+                if mode is None and settings.TENANT_PROVISIONING_MODE == "template":
+                    logger.info(f"Creating database from schema template: {db_name}")
+                    try:
+                        await run_blocking(create_database_from_template, db_name)
+                        mode = "template"
+                    except Exception as template_error:
+                        logger.error(f"Template provisioning failed, falling back to DDL: {str(template_error)}")
+
+                if mode is None:
+                    logger.info(f"Creating database: {db_name}")
+                    await run_blocking(create_database, db_name)
+                    mode = "ddl"
+                step["mode"] = mode
+
+        # Step 3: Create PERFECT schema (directly from HRMS models, no migrations needed);
+        # a spare or cloned database already has it and only needs the per-tenant update
+        if "create_schema" in steps:
+            mode = recorder.timings()["database_mode"]
+            await set_provisioning_step(db, tenant, "create_schema")
+            async with recorder.step("create_schema"):
+                logger.info(f"Creating PERFECT schema in: {db_name}")
+                try:
+                    if mode in ("spare", "template"):
+                        schema_result = await run_blocking(apply_tenant_settings, db_name, tenant_id)
+                    else:
+                        # Starts by resetting the public schema, so it can be re-run
+                        schema_result = await run_blocking(create_perfect_tenant_schema, db_name, tenant_id)
+                    if schema_result["status"] == "error":
+                        raise Exception(schema_result["message"])
+                except Exception as schema_error:
+                    logger.error(f"Schema creation failed: {str(schema_error)}")
+                    # Mark tenant as failed
+                    await mark_tenant_status(db, tenant, "schema_failed")
+                    raise ProvisioningError("create_schema", f"Failed to create schema: {str(schema_error)}")
+
+        # Step 4: Generate secure random password for admin and seed user
+        await set_provisioning_step(db, tenant, "hash_password")
+        async with recorder.step("hash_password"):
+            initial_password = generate_secure_password(12)
+            hashed_password = await hash_password_async(initial_password)
+
+        await set_provisioning_step(db, tenant, "seed_admin")
+        async with recorder.step("seed_admin"):
+            logger.info(f"Seeding admin user in: {db_name} with tenant_id={tenant_id}")
+            try:
+                # On resume the admin may exist already; it gets the new password
+                await run_blocking(seed_initial_admin, db_name, admin_email, hashed_password, tenant_id, resumed)
+            except Exception as seed_error:
+                logger.error(f"Failed to seed admin user: {str(seed_error)}")
+                # Mark tenant as failed
+                await mark_tenant_status(db, tenant, "seed_failed")
+                raise ProvisioningError("seed_admin", f"Failed to seed admin user: {str(seed_error)}")
+
+        # Every step done: the tenant becomes resolvable
+        tenant.provisioning_step = None
+        await mark_tenant_status(db, tenant, "active")
+
+        timings = recorder.timings()
+        logger.info(f"Successfully provisioned tenant: {tenant.name} (ID: {tenant_id}) in {timings['total_ms']} ms {timings['steps_ms']}")
+        return {
+            "tenant_id": tenant_id,
+            "tenant_db": db_name,
+            "admin_email": admin_email,
+            "initial_password": initial_password,
+            "provisioning_timings": timings
+        }
+
+    except ProvisioningError:
+        outcome = "failed"
+        raise
+    except Exception as e:
+        # Log the full error for debugging
+        error_trace = traceback.format_exc()
+        logger.error(f"Failed to create tenant: {str(e)}\n{error_trace}")
+
+        # Mark tenant as failed
+        try:
+            await mark_tenant_status(db, tenant, "failed")
+        except Exception as update_error:
+            logger.error(f"Failed to update tenant status: {str(update_error)}")
+
+        outcome = "failed"
+        raise ProvisioningError(recorder.current_step, f"Failed to create tenant: {str(e)}")
+    finally:
+        timings = recorder.timings()
+        total_duration.observe(timings["total_ms"], db_host=recorder.db_host, status=outcome)
+        try:
+            await save_provisioning_timings(db, tenant_id, timings)
+        except Exception as timings_error:
+            logger.error(f"Failed to save provisioning timings of tenant {tenant_id}: {str(timings_error)}")
+            await db.rollback()
+
+
+async def provision_tenants_bulk(items: list, concurrency: int):
+    """
+    Provision many tenants in parallel, yielding one result per tenant as it completes.
+
+    At most concurrency tenants are provisioned at a time, each with its own
+    super_admin_db session. A failed tenant does not stop the others. If the
+    consumer stops iterating (e.g. the client disconnected), tenants that
+    have not started are skipped; tenants already being provisioned finish.
+
+    Args:
+        items: TenantCreate items
+        concurrency: Maximum number of tenants provisioned at the same time
+
+    Yields:
+        dict per tenant with index (position in items), company_name,
+        status ("succeeded" or "failed"), duration_ms and either the
+        provisioning result (including initial_password) or step and error
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    stopped = False
+
+    async def provision_one(index: int, item) -> dict:
+        async with semaphore:
+            if stopped:
+                return None
+
+            started = time.perf_counter()
+            outcome = {"index": index, "company_name": item.company_name}
+            try:
+                async with AsyncSessionLocal() as db:
+                    result = await provision_tenant(
+                        db,
+                        name=item.name,
+                        company_name=item.company_name,
+                        admin_email=item.admin_email
+                    )
+                outcome.update(status="succeeded", **result)
+            except ProvisioningError as e:
+                outcome.update(status="failed", step=e.step, error=e.detail)
+            except Exception as e:
+                logger.error(f"Bulk provisioning of {item.company_name} failed: {str(e)}")
+                outcome.update(status="failed", step=None, error=f"Failed to create tenant: {str(e)}")
+
+            outcome["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            return outcome
+
+    tasks = [asyncio.create_task(provision_one(index, item)) for index, item in enumerate(items)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Not cancelled: a tenant half-way through provisioning is left to finish
+        stopped = True
@@ -0,0 +1,38 @@
+"""Model for background provisioning jobs."""
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Text
+from datetime import datetime
+from app.superadmin.models import SuperAdminBase
+
+
+class ProvisioningJob(SuperAdminBase):
+    """
+    A tenant provisioning run executed by the background job queue.
+    
+    steps holds the status and timing of every provisioning step and is
+    updated as the job progresses. initial_password_encrypted holds the
+    initial admin password encrypted with PROVISIONING_JOB_PASSWORD_KEYS,
+    only until it is collected once (or PROVISIONING_JOB_PASSWORD_TTL_SECONDS
+    passed); it is never stored in plaintext. worker_id and heartbeat_at
+    identify the process running the job and when it last reported in.
+    """
+    
+    __tablename__ = "provisioning_jobs"
+    
+    id = Column(String(32), primary_key=True)
+    job_type = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="queued", index=True)
+    params = Column(JSON, nullable=False)
+    steps = Column(JSON, nullable=True)
+    tenant_id = Column(Integer, nullable=True, index=True)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    worker_id = Column(String, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    initial_password_encrypted = Column(Text, nullable=True)
+    password_collected_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f"<ProvisioningJob(id='{self.id}', job_type='{self.job_type}', status='{self.status}')>"
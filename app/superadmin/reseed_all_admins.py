@@ -1,8 +1,8 @@
 """
 Re-seed admin users for all tenants after schema recreation.
 """
-from sqlalchemy import create_engine, text
-from app.config import settings
+from sqlalchemy import text
+from app.database import get_tenant_engine
 from app.security import hash_password
 from app.utils import generate_secure_password
 import logging
@@ -10,7 +10,13 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-def reseed_tenant_admin(db_name: str, admin_email: str, tenant_id: int) -> dict:
+def reseed_tenant_admin(
+    db_name: str,
+    admin_email: str,
+    tenant_id: int,
+    new_password: str = None,
+    hashed_password: str = None
+) -> dict:
     """
     Re-seed admin user in a tenant database.
     
@@ -18,20 +24,22 @@ def reseed_tenant_admin(db_name: str, admin_email: str, tenant_id: int) -> dict:
         db_name: Name of the tenant database
         admin_email: Email for the admin user
         tenant_id: The Super Admin tenant ID
+        new_password: Password to set (generated if omitted)
+        hashed_password: bcrypt hash of new_password, when already hashed
+            (e.g. in a batch by app.hashing.hash_passwords)
         
     Returns:
         dict with status, message, and new password
     """
     try:
-        # Construct database URL
-        db_url = f"{settings.POSTGRES_SERVER_URL.rsplit('/', 1)[0]}/{db_name}"
-        db_url = db_url.replace('/postgres', f'/{db_name}')
-        
-        engine = create_engine(db_url, pool_pre_ping=True)
+        # Shared engine for the tenant database
+        engine = get_tenant_engine(db_name)
         
         # Generate new password
-        new_password = generate_secure_password(12)
-        hashed_password = hash_password(new_password)
+        if new_password is None:
+            new_password = generate_secure_password(12)
+        if hashed_password is None:
+            hashed_password = hash_password(new_password)
         
         with engine.connect() as connection:
             # Check if admin user already exists
@@ -1,20 +1,30 @@
 """API routes for Super Admin Service."""
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.orm.exc import StaleDataError
 from typing import List
-from app.database import get_super_admin_db
-from app.superadmin.schemas import TenantCreate, TenantResponse, TenantInfo
-from app.superadmin.service import create_tenant_record, list_tenants, delete_tenant_record, toggle_tenant_status, update_tenant_status
-from app.hrms_provisioning.database_creator import create_database
+from app.database import get_super_admin_async_db, get_super_admin_read_db
+from app.concurrency import run_blocking
+from app.superadmin.schemas import TenantCreate, TenantResponse, TenantInfo, ProvisioningJobInfo, InitialPasswordResponse, TenantMigrationRequest
+from app.superadmin.service import list_tenants, delete_tenant_record, toggle_tenant_status, update_tenant_status, record_tenant_event, get_tenant_by_id, company_name_taken
+from app.superadmin.provisioning import provision_tenant, provision_tenants_bulk, resume_provisioning, resume_step, ProvisioningError, TenantConflictError
+from app.superadmin.jobs import provisioning_jobs, JobQueueFull, PasswordKeyMissing, job_to_dict, get_job, collect_initial_password
+from app.hrms_provisioning.template_db import ensure_template, template_status
+from app.hrms_provisioning.spare_pool import spare_pool_status, spare_pool_refiller
 from app.hrms_provisioning.run_migrations import run_tenant_migrations
-from app.hrms_provisioning.seed_admin import seed_initial_admin
-from app.security import hash_password
-from app.utils import generate_secure_password
+from app.hrms_provisioning.fleet_migrations import resolve_target, fleet_revision_status, MIGRATION_FAILURE_POLICIES
 from app.config import settings
-from app.superadmin.create_perfect_schema import create_perfect_tenant_schema
+from app.superadmin.create_perfect_schema import create_perfect_tenant_schema, PERFECT_SCHEMA_VERSION
 from app.superadmin.reseed_all_admins import reseed_tenant_admin
-import time
+from app.hashing import hash_passwords
+from app.utils import generate_secure_password
+from app.tenants.service import find_active_tenant_by_company, find_active_tenant_by_email
+from app.tenants.cache import invalidate_tenant, invalidate_email
 import logging
+import orjson
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +34,7 @@ router = APIRouter(prefix="/super-admin", tags=["super-admin"])
 @router.post("/create-tenant", response_model=TenantResponse, status_code=status.HTTP_201_CREATED)
 async def create_tenant(
     tenant_data: TenantCreate,
-    db: Session = Depends(get_super_admin_db)
+    db: AsyncSession = Depends(get_super_admin_async_db)
 ):
     """
     Create a new tenant database and provision it with HRMS migrations and admin user.
@@ -35,100 +45,266 @@ async def create_tenant(
     3. Seeds an initial admin user
     4. Stores tenant metadata in super_admin_db
     5. Returns the initial admin password (shown only once)
+    
+    Safe to call concurrently: a company name that already exists (ignoring
+    case) or is being created by another request gets 409 before any
+    database is created.
     """
-    tenant = None
     try:
-        # Generate unique database name
-        db_name = f"tenant_{tenant_data.name.lower().replace(' ', '_')}_{int(time.time())}"
-        
-        # Build database URL for the tenant
-        db_url = f"postgresql+psycopg2://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{db_name}"
+        result = await provision_tenant(
+            db,
+            name=tenant_data.name,
+            company_name=tenant_data.company_name,
+            admin_email=tenant_data.admin_email
+        )
+    except TenantConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=e.detail
+        )
+    except ProvisioningError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=e.detail
+        )
+    
+    # Initial password is returned once and never stored in plaintext
+    return TenantResponse(**result)
+
+
+@router.post("/jobs/create-tenant", response_model=ProvisioningJobInfo, status_code=status.HTTP_202_ACCEPTED)
+async def create_tenant_job(
+    tenant_data: TenantCreate,
+    db: AsyncSession = Depends(get_super_admin_async_db)
+):
+    """
+    Queue the creation of a new tenant and return immediately.
+    
+    Same provisioning as POST /super-admin/create-tenant, run by a
+    background worker. Poll GET /super-admin/jobs/{job_id} for progress;
+    once the job succeeded, collect the initial admin password with
+    POST /super-admin/jobs/{job_id}/initial-password (works once).
+    
+    Returns:
+        The queued job (202 Accepted)
         
-        # Step 1: Create tenant record in super_admin_db FIRST to get tenant_id
-        logger.info(f"Creating tenant record for: {tenant_data.name} (Company: {tenant_data.company_name})")
-        tenant = create_tenant_record(
-            db=db,
+    Raises:
+        409 if a tenant with the company name already exists (a concurrent
+        creation of the same company fails in the job instead),
+        503 if the job queue is full or PROVISIONING_JOB_PASSWORD_KEYS is not set
+    """
+    if await company_name_taken(db, tenant_data.company_name):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"A tenant with company name '{tenant_data.company_name}' already exists"
+        )
+    
+    try:
+        job = await provisioning_jobs.submit_create_tenant(
+            db,
             name=tenant_data.name,
             company_name=tenant_data.company_name,
-            db_name=db_name,
             admin_email=tenant_data.admin_email
         )
-        tenant_id = tenant.id
-        logger.info(f"Tenant record created with ID: {tenant_id}")
-        
-        # Step 2: Create the database
-        logger.info(f"Creating database: {db_name}")
-        create_database(db_name)
-        
-        # Step 3: Create PERFECT schema (directly from HRMS models, no migrations needed)
-        logger.info(f"Creating PERFECT schema in: {db_name}")
-        try:
-            schema_result = create_perfect_tenant_schema(db_name, tenant_id)
-            if schema_result["status"] == "error":
-                raise Exception(schema_result["message"])
-        except Exception as schema_error:
-            logger.error(f"Schema creation failed: {str(schema_error)}")
-            # Mark tenant as failed
-            tenant.status = "schema_failed"
-            db.commit()
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to create schema: {str(schema_error)}"
-            )
+    except JobQueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Provisioning job queue is full, retry later"
+        )
+    except PasswordKeyMissing:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="PROVISIONING_JOB_PASSWORD_KEYS is not configured; use POST /super-admin/create-tenant"
+        )
+    
+    logger.info(f"Queued provisioning job {job.id} for: {tenant_data.name} (Company: {tenant_data.company_name})")
+    return job_to_dict(job)
+
+
+@router.post("/jobs/migrate-tenants", response_model=ProvisioningJobInfo, status_code=status.HTTP_202_ACCEPTED)
+async def migrate_tenants_job(
+    request: TenantMigrationRequest,
+    db: AsyncSession = Depends(get_super_admin_async_db)
+):
+    """
+    Queue a fleet-wide tenant migration and return immediately.
+    
+    Every active or inactive tenant's alembic_version is read, and tenants
+    not at the target revision are upgraded, request.concurrency (default
+    TENANT_MIGRATION_CONCURRENCY) at a time. Each tenant's revision is
+    recorded in super_admin_db. Poll GET /super-admin/jobs/{job_id}: the
+    result holds the progress counters while running and one outcome per
+    tenant once finished.
+    
+    Returns:
+        The queued job (202 Accepted)
         
-        # Step 4: Generate secure random password for admin and seed user
-        initial_password = generate_secure_password(12)
-        hashed_password = hash_password(initial_password)
-        
-        logger.info(f"Seeding admin user in: {db_name} with tenant_id={tenant_id}")
-        try:
-            seed_initial_admin(db_url, tenant_data.admin_email, hashed_password, tenant_id)
-        except Exception as seed_error:
-            logger.error(f"Failed to seed admin user: {str(seed_error)}")
-            # Mark tenant as failed
-            tenant.status = "seed_failed"
-            db.commit()
+    Raises:
+        422 if the target revision or failure policy is invalid,
+        503 if the job queue is full
+    """
+    if request.on_failure not in MIGRATION_FAILURE_POLICIES:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"on_failure must be one of: {', '.join(MIGRATION_FAILURE_POLICIES)}"
+        )
+    if request.concurrency is not None and request.concurrency < 1:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="concurrency must be at least 1"
+        )
+    try:
+        await run_blocking(resolve_target, request.target)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    
+    try:
+        job = await provisioning_jobs.submit_migrate_tenants(
+            db,
+            target=request.target,
+            concurrency=request.concurrency,
+            on_failure=request.on_failure
+        )
+    except JobQueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Provisioning job queue is full, retry later"
+        )
+    
+    logger.info(f"Queued fleet migration job {job.id} to {request.target}")
+    return job_to_dict(job)
+
+
+@router.get("/jobs/{job_id}", response_model=ProvisioningJobInfo)
+async def get_provisioning_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_super_admin_async_db)
+):
+    """
+    Get the status of a provisioning job, with the status and timing of each step.
+    
+    Args:
+        job_id: ID returned by POST /super-admin/jobs/create-tenant
+    """
+    job = await get_job(db, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found"
+        )
+    return job_to_dict(job)
+
+
+@router.post("/jobs/{job_id}/initial-password", response_model=InitialPasswordResponse)
+async def collect_job_initial_password(
+    job_id: str,
+    db: AsyncSession = Depends(get_super_admin_async_db)
+):
+    """
+    Collect the initial admin password of a finished create-tenant job.
+    
+    The password is handed out exactly once and then deleted. It is also
+    deleted if not collected within PROVISIONING_JOB_PASSWORD_TTL_SECONDS.
+    
+    Args:
+        job_id: ID returned by POST /super-admin/jobs/create-tenant
+        
+    Raises:
+        404 if the job does not exist, 409 if it has not succeeded (yet),
+        410 if the password was already collected or expired
+    """
+    initial_password = await collect_initial_password(db, job_id)
+    job = await get_job(db, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found"
+        )
+    
+    if initial_password is None:
+        if job.status != "succeeded":
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to seed admin user: {str(seed_error)}"
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Job {job_id} is {job.status}, no initial password available"
             )
-        
-        # Step 6: Return response with initial password (never stored in plaintext)
-        logger.info(f"Successfully created tenant: {tenant_data.name} (ID: {tenant.id})")
-        return TenantResponse(
-            tenant_id=tenant.id,
-            tenant_db=db_name,
-            admin_email=tenant_data.admin_email,
-            initial_password=initial_password
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail=f"Initial password of job {job_id} was already collected or has expired"
         )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        # Log the full error for debugging
-        import traceback
-        error_trace = traceback.format_exc()
-        logger.error(f"Failed to create tenant: {str(e)}\n{error_trace}")
-        
-        # Mark tenant as failed if record exists
-        if tenant:
-            try:
-                tenant.status = "failed"
-                db.commit()
-            except Exception as update_error:
-                logger.error(f"Failed to update tenant status: {str(update_error)}")
-        
+    
+    logger.info(f"Initial password of job {job_id} collected")
+    return InitialPasswordResponse(
+        job_id=job.id,
+        tenant_id=job.tenant_id,
+        admin_email=job.result["admin_email"],
+        initial_password=initial_password
+    )
+
+
+@router.post("/tenants/bulk")
+async def create_tenants_bulk(tenants: List[TenantCreate]):
+    """
+    Create many tenants at once, provisioned in parallel.
+    
+    At most TENANT_BULK_CONCURRENCY tenants are provisioned at the same
+    time. The response is streamed as NDJSON: one line per tenant as soon as
+    it is done (in completion order, with its index in the request), then a
+    summary line. A failed tenant is reported on its line and does not stop
+    the others.
+    
+    Succeeded lines carry tenant_id, tenant_db, admin_email and the
+    initial_password (shown only once); failed lines carry the failed step
+    and the error.
+    """
+    if not tenants:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to create tenant: {str(e)}"
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="No tenants given"
         )
+    if len(tenants) > settings.TENANT_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Too many tenants: {len(tenants)} (maximum {settings.TENANT_BULK_MAX_ITEMS})"
+        )
+    
+    logger.info(f"Bulk provisioning {len(tenants)} tenants (concurrency {settings.TENANT_BULK_CONCURRENCY})")
+    
+    async def stream():
+        started = time.perf_counter()
+        succeeded = 0
+        failed = 0
+        async for outcome in provision_tenants_bulk(tenants, settings.TENANT_BULK_CONCURRENCY):
+            if outcome["status"] == "succeeded":
+                succeeded += 1
+            else:
+                failed += 1
+            yield orjson.dumps(outcome) + b"\n"
+        
+        logger.info(f"Bulk provisioning finished: {succeeded} succeeded, {failed} failed")
+        yield orjson.dumps({
+            "summary": {
+                "total": len(tenants),
+                "succeeded": succeeded,
+                "failed": failed,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1)
+            }
+        }) + b"\n"
+    
+    return StreamingResponse(
+        stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.get("/tenants", response_model=List[TenantInfo])
 async def get_tenants(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_super_admin_db)
+    db: AsyncSession = Depends(get_super_admin_read_db)
 ):
     """
     Get a list of all tenants.
@@ -137,7 +313,7 @@ async def get_tenants(
     Does not include sensitive credentials.
     """
     try:
-        tenants = list_tenants(db, skip=skip, limit=limit)
+        tenants = await list_tenants(db, skip=skip, limit=limit)
         return tenants
     except Exception as e:
         logger.error(f"Failed to list tenants: {str(e)}")
@@ -150,7 +326,7 @@ async def get_tenants(
 @router.get("/tenants/find-by-company/{company_name}")
 async def find_tenant_by_company(
     company_name: str,
-    db: Session = Depends(get_super_admin_db)
+    db: AsyncSession = Depends(get_super_admin_read_db)
 ):
     """
     Get tenant database information by company name.
@@ -167,34 +343,31 @@ async def find_tenant_by_company(
         Tenant database connection information
     """
     try:
-        from app.superadmin.models import Tenant
-        
-        # Find tenant by company name
-        tenant = db.query(Tenant).filter(
-            Tenant.company_name == company_name,
-            Tenant.status == "active"
-        ).first()
+        # Find tenant by company name (shared cached lookup, case-insensitive)
+        payloads = await find_active_tenant_by_company(db, company_name)
         
-        if not tenant:
+        if not payloads:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"No active tenant found for company: {company_name}"
             )
         
+        tenant = payloads.tenant
+        
         # Override host/port for local development if LOCAL_DB_HOST is set
-        db_host = settings.LOCAL_DB_HOST if settings.LOCAL_DB_HOST else tenant.db_host
-        db_port = settings.LOCAL_DB_PORT if settings.LOCAL_DB_PORT else tenant.db_port
+        db_host = settings.LOCAL_DB_HOST if settings.LOCAL_DB_HOST else tenant["db_host"]
+        db_port = settings.LOCAL_DB_PORT if settings.LOCAL_DB_PORT else tenant["db_port"]
         
         # Return tenant database info for HRMS backend
         return {
-            "tenant_id": tenant.id,
-            "tenant_name": tenant.name,
-            "company_name": tenant.company_name,
-            "db_name": tenant.db_name,
+            "tenant_id": tenant["id"],
+            "tenant_name": tenant["name"],
+            "company_name": tenant["company_name"],
+            "db_name": tenant["db_name"],
             "db_host": db_host,
             "db_port": db_port,
-            "db_user": tenant.db_user,
-            "db_password": tenant.db_password
+            "db_user": tenant["db_user"],
+            "db_password": tenant["db_password"]
         }
         
     except HTTPException:
@@ -210,7 +383,7 @@ async def find_tenant_by_company(
 @router.get("/tenants/find-by-email/{email}")
 async def find_tenant_by_email(
     email: str,
-    db: Session = Depends(get_super_admin_db)
+    db: AsyncSession = Depends(get_super_admin_read_db)
 ):
     """
     Get tenant database information by user email.
@@ -219,54 +392,38 @@ async def find_tenant_by_email(
     This endpoint is kept for backwards compatibility.
     
     Args:
-        email: The user's email address
+        email: The user's email address (admin or registered user, case-insensitive)
         
     Returns:
         Tenant database connection information
     """
     try:
-        from app.superadmin.models import Tenant
-        from app.superadmin.tenant_users_model import TenantUser
+        # Admin emails and tenant_users in one query (shared cached lookup)
+        payloads = await find_active_tenant_by_email(db, email)
         
-        # First check if it's an admin email
-        tenant = db.query(Tenant).filter(
-            Tenant.admin_email == email,
-            Tenant.status == "active"
-        ).first()
-        
-        # If not an admin, check tenant_users table
-        if not tenant:
-            tenant_user = db.query(TenantUser).filter(
-                TenantUser.email == email
-            ).first()
-            
-            if tenant_user:
-                tenant = db.query(Tenant).filter(
-                    Tenant.id == tenant_user.tenant_id,
-                    Tenant.status == "active"
-                ).first()
-        
-        if not tenant:
+        if not payloads:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"No active tenant found for email: {email}"
             )
         
+        tenant = payloads.tenant
+        
         # Override host/port for local development if LOCAL_DB_HOST is set
-        db_host = settings.LOCAL_DB_HOST if settings.LOCAL_DB_HOST else tenant.db_host
-        db_port = settings.LOCAL_DB_PORT if settings.LOCAL_DB_PORT else tenant.db_port
+        db_host = settings.LOCAL_DB_HOST if settings.LOCAL_DB_HOST else tenant["db_host"]
+        db_port = settings.LOCAL_DB_PORT if settings.LOCAL_DB_PORT else tenant["db_port"]
         
         # Return tenant database info for HRMS backend
         return {
-            "tenant_id": tenant.id,
-            "tenant_name": tenant.name,
-            "company_name": tenant.company_name,
-            "db_name": tenant.db_name,
+            "tenant_id": tenant["id"],
+            "tenant_name": tenant["name"],
+            "company_name": tenant["company_name"],
+            "db_name": tenant["db_name"],
             "db_host": db_host,
             "db_port": db_port,
-            "db_user": tenant.db_user,
-            "db_password": tenant.db_password,
-            "admin_email": tenant.admin_email
+            "db_user": tenant["db_user"],
+            "db_password": tenant["db_password"],
+            "admin_email": tenant["admin_email"]
         }
         
     except HTTPException:
@@ -283,7 +440,7 @@ async def find_tenant_by_email(
 async def register_tenant_user(
     tenant_id: int,
     user_data: dict,
-    db: Session = Depends(get_super_admin_db)
+    db: AsyncSession = Depends(get_super_admin_async_db)
 ):
     """
     Register a user's email with a tenant for login lookup.
@@ -310,10 +467,13 @@ async def register_tenant_user(
             )
         
         # Verify tenant exists and is active
-        tenant = db.query(Tenant).filter(
-            Tenant.id == tenant_id,
-            Tenant.status == "active"
-        ).first()
+        result = await db.execute(
+            select(Tenant).where(
+                Tenant.id == tenant_id,
+                Tenant.status == "active"
+            )
+        )
+        tenant = result.scalars().first()
         
         if not tenant:
             raise HTTPException(
@@ -322,17 +482,21 @@ async def register_tenant_user(
             )
         
         # Check if user email already registered
-        existing_user = db.query(TenantUser).filter(
-            TenantUser.email == email
-        ).first()
+        result = await db.execute(
+            select(TenantUser).where(TenantUser.email == email)
+        )
+        existing_user = result.scalars().first()
         
         if existing_user:
             # Update tenant_id if different
             if existing_user.tenant_id != tenant_id:
                 logger.warning(f"User {email} moving from tenant {existing_user.tenant_id} to {tenant_id}")
                 existing_user.tenant_id = tenant_id
-                db.commit()
-                db.refresh(existing_user)
+                # Every worker drops its cached lookup of the email
+                await record_tenant_event(db, tenant, "user_registered", user_email=email)
+                await db.commit()
+                await db.refresh(existing_user)
+                invalidate_email(email)
                 
             return {
                 "status": "updated",
@@ -348,8 +512,11 @@ async def register_tenant_user(
         )
         
         db.add(tenant_user)
-        db.commit()
-        db.refresh(tenant_user)
+        # Every worker drops its cached lookup (or cached 404) of the email
+        await record_tenant_event(db, tenant, "user_registered", user_email=email)
+        await db.commit()
+        await db.refresh(tenant_user)
+        invalidate_email(email)
         
         logger.info(f"Registered user {email} for tenant {tenant_id} ({tenant.name})")
         
@@ -364,7 +531,7 @@ async def register_tenant_user(
         raise
     except Exception as e:
         logger.error(f"Failed to register user: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to register user: {str(e)}"
@@ -374,7 +541,7 @@ async def register_tenant_user(
 @router.delete("/tenants/{tenant_id}", status_code=status.HTTP_200_OK)
 async def delete_tenant(
     tenant_id: int,
-    db: Session = Depends(get_super_admin_db)
+    db: AsyncSession = Depends(get_super_admin_async_db)
 ):
     """
     Delete a tenant record from the super_admin_db.
@@ -392,7 +559,7 @@ async def delete_tenant(
     try:
         # First get the tenant to retrieve the db_name
         from app.superadmin.service import get_tenant_by_id
-        tenant = get_tenant_by_id(db, tenant_id)
+        tenant = await get_tenant_by_id(db, tenant_id)
         
         if not tenant:
             raise HTTPException(
@@ -403,7 +570,7 @@ async def delete_tenant(
         db_name = tenant.db_name
         
         # Delete the tenant record
-        success = delete_tenant_record(db, tenant_id)
+        success = await delete_tenant_record(db, tenant_id)
         
         if not success:
             raise HTTPException(
@@ -433,7 +600,7 @@ async def delete_tenant(
 @router.patch("/tenants/{tenant_id}/toggle-status", response_model=TenantInfo)
 async def toggle_tenant_status_endpoint(
     tenant_id: int,
-    db: Session = Depends(get_super_admin_db)
+    db: AsyncSession = Depends(get_super_admin_async_db)
 ):
     """
     Toggle tenant status between 'active' and 'inactive'.
@@ -448,9 +615,12 @@ async def toggle_tenant_status_endpoint(
         
     Returns:
         Updated tenant information with new status
+        
+    Raises:
+        409 if the tenant was changed concurrently (e.g. a second toggle)
     """
     try:
-        tenant = toggle_tenant_status(db, tenant_id)
+        tenant = await toggle_tenant_status(db, tenant_id)
         
         logger.info(f"Toggled tenant {tenant_id} status to: {tenant.status}")
         
@@ -461,6 +631,11 @@ async def toggle_tenant_status_endpoint(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except StaleDataError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Tenant {tenant_id} was changed concurrently, retry"
+        )
     except Exception as e:
         logger.error(f"Failed to toggle tenant {tenant_id} status: {str(e)}")
         raise HTTPException(
@@ -473,7 +648,7 @@ async def toggle_tenant_status_endpoint(
 async def update_tenant_status_endpoint(
     tenant_id: int,
     status_value: str,
-    db: Session = Depends(get_super_admin_db)
+    db: AsyncSession = Depends(get_super_admin_async_db)
 ):
     """
     Update tenant status to a specific value.
@@ -484,9 +659,12 @@ async def update_tenant_status_endpoint(
         
     Returns:
         Updated tenant information with new status
+        
+    Raises:
+        409 if the tenant was changed concurrently
     """
     try:
-        tenant = update_tenant_status(db, tenant_id, status_value)
+        tenant = await update_tenant_status(db, tenant_id, status_value)
         
         logger.info(f"Updated tenant {tenant_id} status to: {status_value}")
         
@@ -497,6 +675,11 @@ async def update_tenant_status_endpoint(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except StaleDataError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Tenant {tenant_id} was changed concurrently, retry"
+        )
     except Exception as e:
         logger.error(f"Failed to update tenant {tenant_id} status: {str(e)}")
         raise HTTPException(
@@ -505,8 +688,149 @@ async def update_tenant_status_endpoint(
         )
 
 
+@router.post("/tenants/{tenant_id}/resume", response_model=TenantResponse)
+async def resume_tenant_provisioning(
+    tenant_id: int,
+    force: bool = False,
+    db: AsyncSession = Depends(get_super_admin_async_db)
+):
+    """
+    Continue the failed provisioning of a tenant from the step that failed.
+    
+    Works for tenants in status failed, schema_failed or seed_failed. Steps
+    that already succeeded are skipped and the existing database is reused;
+    a tenant whose admin seed failed only needs the seed. Returns a new
+    initial admin password (shown only once), like create-tenant.
+    
+    Args:
+        tenant_id: The ID of the tenant to resume
+        force: Also resume a tenant still in status 'provisioning', for runs
+            interrupted by a restart (make sure no run is still active)
+    """
+    tenant = await get_tenant_by_id(db, tenant_id)
+    if not tenant:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tenant with ID {tenant_id} not found"
+        )
+    
+    resumable = ["failed", "schema_failed", "seed_failed"] + (["provisioning"] if force else [])
+    if tenant.status not in resumable:
+        if tenant.status == "provisioning":
+            detail = f"Tenant {tenant_id} is being provisioned (step {tenant.provisioning_step}); use force=true if that run was interrupted"
+        else:
+            detail = f"Tenant {tenant_id} is {tenant.status}, nothing to resume"
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=detail
+        )
+    
+    logger.info(f"Resuming provisioning of tenant {tenant_id} ({tenant.status}) from step {resume_step(tenant)}")
+    try:
+        result = await resume_provisioning(db, tenant)
+    except StaleDataError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Tenant {tenant_id} was changed concurrently (already being resumed?)"
+        )
+    except ProvisioningError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=e.detail
+        )
+    
+    return TenantResponse(**result)
+
+
+@router.get("/tenant-template")
+async def get_tenant_template():
+    """
+    Get the state of the tenant schema template database.
+    
+    Returns:
+        dict with the current schema version, template database name and
+        whether it exists
+    """
+    try:
+        return await run_blocking(template_status)
+    except Exception as e:
+        logger.error(f"Failed to get tenant template status: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get tenant template status: {str(e)}"
+        )
+
+
+@router.post("/tenant-template/rebuild", status_code=status.HTTP_200_OK)
+async def rebuild_tenant_template():
+    """
+    Rebuild the tenant schema template database from the perfect schema.
+    
+    Run this after changing the schema definition if the template should be
+    ready before the next tenant is created (otherwise the first
+    provisioning after the change builds it).
+    
+    Returns:
+        dict with the current schema version and template database name
+    """
+    try:
+        template_name = await run_blocking(ensure_template, True)
+        logger.info(f"Rebuilt tenant template {template_name}")
+        
+        return {
+            "message": "Tenant template rebuilt",
+            "schema_version": PERFECT_SCHEMA_VERSION,
+            "template_db": template_name
+        }
+    except Exception as e:
+        logger.error(f"Failed to rebuild tenant template: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to rebuild tenant template: {str(e)}"
+        )
+
+
+@router.get("/spare-databases")
+async def get_spare_databases():
+    """
+    Get the state of the warm pool of spare tenant databases.
+    
+    Returns:
+        dict with the schema version, configured pool size, ready spare
+        databases and the refill state of the answering worker
+    """
+    try:
+        pool_status = await run_blocking(spare_pool_status)
+        return {**pool_status, "refiller": spare_pool_refiller.stats()}
+    except Exception as e:
+        logger.error(f"Failed to get spare database pool status: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get spare database pool status: {str(e)}"
+        )
+
+
+@router.get("/tenant-migrations")
+async def get_tenant_migrations(db: AsyncSession = Depends(get_super_admin_read_db)):
+    """
+    Get the tenant_migrations head revision(s) and how many tenants are at each revision.
+    
+    Counts come from the revisions recorded by the last fleet migration
+    (POST /super-admin/jobs/migrate-tenants); tenant databases are not
+    contacted.
+    """
+    try:
+        return await fleet_revision_status(db)
+    except Exception as e:
+        logger.error(f"Failed to get tenant migration status: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get tenant migration status: {str(e)}"
+        )
+
+
 @router.post("/fix-all-tenant-schemas", status_code=status.HTTP_200_OK)
-async def fix_all_tenant_schemas(db: Session = Depends(get_super_admin_db)):
+async def fix_all_tenant_schemas(db: AsyncSession = Depends(get_super_admin_async_db)):
     """
     Fix schema for all existing tenant databases by adding missing is_admin column.
     
@@ -518,7 +842,7 @@ async def fix_all_tenant_schemas(db: Session = Depends(get_super_admin_db)):
     """
     try:
         # Get all active tenants
-        tenants = list_tenants(db, skip=0, limit=1000)
+        tenants = await list_tenants(db, skip=0, limit=1000)
         
         results = []
         fixed_count = 0
@@ -527,7 +851,7 @@ async def fix_all_tenant_schemas(db: Session = Depends(get_super_admin_db)):
         for tenant in tenants:
             logger.info(f"Creating PERFECT schema for tenant: {tenant.name} (DB: {tenant.db_name}, ID: {tenant.id})")
             # Drop and recreate with PERFECT schema from HRMS models
-            result = create_perfect_tenant_schema(tenant.db_name, tenant.id)
+            result = await run_blocking(create_perfect_tenant_schema, tenant.db_name, tenant.id)
             
             results.append({
                 "tenant_id": tenant.id,
@@ -559,7 +883,7 @@ async def fix_all_tenant_schemas(db: Session = Depends(get_super_admin_db)):
 
 
 @router.post("/reseed-all-admins", status_code=status.HTTP_200_OK)
-async def reseed_all_admin_users(db: Session = Depends(get_super_admin_db)):
+async def reseed_all_admin_users(db: AsyncSession = Depends(get_super_admin_async_db)):
     """
     Re-seed admin users for ALL tenants.
     
@@ -571,15 +895,21 @@ async def reseed_all_admin_users(db: Session = Depends(get_super_admin_db)):
     """
     try:
         # Get all tenants
-        tenants = list_tenants(db, skip=0, limit=1000)
+        tenants = await list_tenants(db, skip=0, limit=1000)
         
         results = []
         success_count = 0
         error_count = 0
         
-        for tenant in tenants:
+        # Hash every new password up front, in parallel on the hashing pool
+        new_passwords = [generate_secure_password(12) for _ in tenants]
+        hashed_passwords = await hash_passwords(new_passwords)
+        
+        for tenant, new_password, hashed_password in zip(tenants, new_passwords, hashed_passwords):
             logger.info(f"Re-seeding admin for tenant: {tenant.name} (DB: {tenant.db_name}, ID: {tenant.id})")
-            result = reseed_tenant_admin(tenant.db_name, tenant.admin_email, tenant.id)
+            result = await run_blocking(
+                reseed_tenant_admin, tenant.db_name, tenant.admin_email, tenant.id, new_password, hashed_password
+            )
             
             results.append({
                 "tenant_id": tenant.id,
@@ -594,11 +924,16 @@ async def reseed_all_admin_users(db: Session = Depends(get_super_admin_db)):
             if result["status"] == "success":
                 success_count += 1
                 # Update tenant status to active
-                tenant.status = "active"
+                if tenant.status != "active":
+                    tenant.status = "active"
+                    await record_tenant_event(db, tenant, "status_changed")
             else:
                 error_count += 1
         
-        db.commit()
+        await db.commit()
+        
+        for tenant in tenants:
+            invalidate_tenant(tenant.id, tenant.company_name, tenant.admin_email)
         
         logger.info(f"Admin re-seed complete. Success: {success_count}, Errors: {error_count}")
         
@@ -1,7 +1,7 @@
 """Pydantic schemas for Super Admin Service."""
 from pydantic import BaseModel, EmailStr
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List, Dict, Union
 
 
 class TenantCreate(BaseModel):
@@ -11,12 +11,22 @@ class TenantCreate(BaseModel):
     admin_email: EmailStr
 
 
+class ProvisioningTimings(BaseModel):
+    """Per-step duration breakdown of a tenant's provisioning run."""
+    steps_ms: Dict[str, float]
+    total_ms: float
+    database_mode: Optional[str] = None  # "spare", "template", "ddl" or "existing" (resumed)
+    db_host: Optional[str] = None
+    resumed_from: Optional[str] = None  # step a resumed run started at
+
+
 class TenantResponse(BaseModel):
     """Schema for tenant response."""
     tenant_id: int
     tenant_db: str
     admin_email: str
     initial_password: str
+    provisioning_timings: Optional[ProvisioningTimings] = None
     
     class Config:
         from_attributes = True
@@ -34,6 +44,10 @@ class TenantInfo(BaseModel):
     admin_email: str
     status: str
     created_at: datetime
+    provisioning_step: Optional[str] = None  # step running or failed; None once provisioned
+    provisioning_timings: Optional[ProvisioningTimings] = None
+    schema_revision: Optional[str] = None  # tenant_migrations revision(s) recorded by the last fleet migration
+    schema_checked_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
@@ -60,3 +74,143 @@ class TenantByIdResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+class TenantResolveRequest(BaseModel):
+    """Schema for batch tenant resolution."""
+    tenant_ids: List[int] = []
+    company_names: List[str] = []
+    emails: List[str] = []
+
+
+class TenantResolveNotFound(BaseModel):
+    """Keys of a batch resolution that did not resolve to a tenant."""
+    tenant_ids: List[int] = []
+    company_names: List[str] = []
+    emails: List[str] = []
+
+
+class TenantResolveResponse(BaseModel):
+    """
+    Schema for batch tenant resolution response.
+    
+    Every requested key is present; keys that did not resolve map to null
+    and are also listed in not_found.
+    """
+    tenant_ids: Dict[int, Optional[TenantByIdResponse]]
+    company_names: Dict[str, Optional[TenantByEmailResponse]]
+    emails: Dict[str, Optional[TenantByEmailResponse]]
+    not_found: TenantResolveNotFound
+
+
+class TenantDirectoryEntry(BaseModel):
+    """Routing info of one active tenant in the tenant directory."""
+    tenant_id: int
+    company_name: Optional[str]
+    admin_email: str
+    db_url: str
+    version: int
+
+
+class TenantDirectoryRemoved(BaseModel):
+    """Tombstone for a tenant that left the directory (deleted or no longer active)."""
+    tenant_id: int
+    status: str
+
+
+class TenantDirectoryResponse(BaseModel):
+    """
+    Schema for the tenant directory (full snapshot or delta).
+    
+    version is the high-water mark to pass as ?since= on the next call.
+    When full is true, tenants is the complete directory and the caller
+    must replace its local copy; otherwise it holds the added/changed
+    tenants and removed the tenants to drop.
+    """
+    version: int
+    full: bool
+    tenants: List[TenantDirectoryEntry]
+    removed: List[TenantDirectoryRemoved] = []
+
+
+class ProvisioningStep(BaseModel):
+    """Status and timing of one step of a provisioning job."""
+    name: str
+    status: str  # pending, skipped, running, succeeded, failed
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    duration_ms: Optional[float] = None
+    error: Optional[str] = None
+    mode: Optional[str] = None  # create_database only: "spare", "template", "ddl" or "existing"
+
+
+class ProvisioningJobResult(BaseModel):
+    """Outcome of a successful create-tenant job (without the password)."""
+    tenant_id: int
+    tenant_db: str
+    admin_email: str
+    provisioning_timings: Optional[ProvisioningTimings] = None
+
+
+class TenantMigrationRequest(BaseModel):
+    """Schema for starting a fleet-wide tenant migration."""
+    target: str = "head"  # revision, "head" or "heads"
+    concurrency: Optional[int] = None  # defaults to TENANT_MIGRATION_CONCURRENCY
+    on_failure: str = "stop"  # "stop" skips tenants not started yet, "continue" attempts all
+
+
+class TenantMigrationOutcome(BaseModel):
+    """Result of migrating one tenant database."""
+    tenant_id: int
+    db_name: str
+    status: str  # upgraded, up_to_date, unversioned, failed, skipped
+    from_revisions: Optional[List[str]] = None
+    to_revisions: Optional[List[str]] = None
+    applied: Optional[List[str]] = None
+    bundle: Optional[str] = None  # checksum of the SQL bundle used, if any
+    error: Optional[str] = None
+    duration_ms: Optional[float] = None
+
+
+class TenantMigrationSummary(BaseModel):
+    """Progress, and once finished the outcome, of a fleet migration job."""
+    target: str
+    target_revisions: List[str]
+    on_failure: str
+    concurrency: int
+    total: int
+    checked: int
+    upgraded: int
+    up_to_date: int
+    unversioned: int
+    failed: int
+    skipped: int
+    stopped: bool
+    duration_ms: Optional[float] = None  # set once finished
+    tenants: Optional[List[TenantMigrationOutcome]] = None  # set once finished
+
+
+class ProvisioningJobInfo(BaseModel):
+    """Schema for a background provisioning job."""
+    job_id: str
+    job_type: str
+    status: str  # queued, running, succeeded, failed
+    tenant_id: Optional[int] = None
+    steps: List[ProvisioningStep] = []
+    result: Optional[Union[ProvisioningJobResult, TenantMigrationSummary]] = None
+    error: Optional[str] = None
+    worker_id: Optional[str] = None  # process that claimed the job
+    heartbeat_at: Optional[datetime] = None
+    initial_password_available: bool
+    password_collected_at: Optional[datetime] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_ms: Optional[float] = None
+
+
+class InitialPasswordResponse(BaseModel):
+    """Schema for the one-time collection of a job's initial admin password."""
+    job_id: str
+    tenant_id: int
+    admin_email: str
+    initial_password: str
@@ -1,12 +1,101 @@
 """Service layer for Super Admin operations."""
-from sqlalchemy.orm import Session
+from sqlalchemy import select, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 from app.superadmin.models import Tenant
+from app.superadmin.tenant_events_model import TenantEvent
+from app.tenants.cache import invalidate_tenant
 from app.config import settings
+from datetime import datetime
+import hashlib
+import json
 import time
 
+# Advisory lock serializing tenant event writers, so that event sequence
+# numbers become visible (commit) in the order they were assigned and
+# subscribers can resume from the last sequence number they saw.
+TENANT_EVENTS_LOCK_KEY = 7_341_001
 
-def create_tenant_record(
-    db: Session,
+# Class key of the transaction-level advisory locks taken on normalized company
+# names while a tenant is created (two-key form, so it cannot collide with the
+# single-key locks)
+COMPANY_NAME_LOCK_CLASS = 7_341_004
+
+
+async def record_tenant_event(db: AsyncSession, tenant: Tenant, event_type: str, user_email: str = None) -> TenantEvent:
+    """
+    Append a tenant change to tenant_events and publish it with NOTIFY.
+    
+    Runs inside the caller's transaction: the event row and the
+    notification only become visible when the caller commits. Writers are
+    serialized with a transaction-level advisory lock.
+    
+    Args:
+        db: Database session
+        tenant: Tenant that changed (for 'deleted', before it is deleted)
+        event_type: 'created', 'status_changed', 'deleted' or
+            'user_registered' (a tenant_users email now maps to tenant)
+        user_email: Email of the registered user ('user_registered' only)
+        
+    Returns:
+        The (flushed) TenantEvent with its sequence number
+    """
+    await db.execute(select(func.pg_advisory_xact_lock(TENANT_EVENTS_LOCK_KEY)))
+    
+    event = TenantEvent(
+        tenant_id=tenant.id,
+        event_type=event_type,
+        status=tenant.status,
+        company_name=tenant.company_name,
+        admin_email=tenant.admin_email,
+        user_email=user_email
+    )
+    db.add(event)
+    await db.flush()
+    
+    await db.execute(
+        select(func.pg_notify(settings.TENANT_EVENTS_CHANNEL, json.dumps(event.to_dict())))
+    )
+    return event
+
+
+def normalize_company_name(company_name: str) -> str:
+    """Company name as compared for uniqueness (case-insensitive, like login lookups)."""
+    return company_name.strip().lower()
+
+
+async def lock_company_name(db: AsyncSession, company_name: str) -> bool:
+    """
+    Take the advisory lock of a normalized company name for the current transaction.
+    
+    Held until the caller commits or rolls back, so concurrent creations of
+    the same company (on any worker) cannot both pass company_name_taken.
+    
+    Args:
+        db: Database session
+        company_name: Company name of the tenant being created
+        
+    Returns:
+        True if locked, False if another transaction holds the lock
+    """
+    digest = hashlib.sha256(normalize_company_name(company_name).encode()).digest()
+    key = int.from_bytes(digest[:4], "big", signed=True)
+    result = await db.execute(select(func.pg_try_advisory_xact_lock(COMPANY_NAME_LOCK_CLASS, key)))
+    return bool(result.scalar())
+
+
+async def company_name_taken(db: AsyncSession, company_name: str) -> bool:
+    """Whether a tenant (in any status) already has this company name, ignoring case."""
+    result = await db.execute(
+        select(Tenant.id)
+        .where(func.lower(func.trim(Tenant.company_name)) == normalize_company_name(company_name))
+        .limit(1)
+    )
+    return result.first() is not None
+
+
+async def create_tenant_record(
+    db: AsyncSession,
     name: str,
     company_name: str,
     db_name: str,
@@ -14,7 +103,8 @@ def create_tenant_record(
     db_host: str = None,
     db_port: str = None,
     db_user: str = None,
-    db_password: str = None
+    db_password: str = None,
+    status: str = "active"
 ) -> Tenant:
     """
     Create a tenant record in the super_admin_db.
@@ -29,6 +119,7 @@ def create_tenant_record(
         db_port: Database port (defaults to config)
         db_user: Database user (defaults to config)
         db_password: Database password (defaults to config)
+        status: Initial status ('provisioning' while the database is being built)
         
     Returns:
         Created Tenant instance
@@ -42,30 +133,36 @@ def create_tenant_record(
         db_user=db_user or settings.DB_USER,
         db_password=db_password or settings.DB_PASSWORD,
         admin_email=admin_email,
-        status="active"
+        status=status
     )
     db.add(tenant)
-    db.commit()
-    db.refresh(tenant)
+    await db.flush()
+    await record_tenant_event(db, tenant, "created")
+    await db.commit()
+    await db.refresh(tenant)
+    invalidate_tenant(tenant.id, tenant.company_name, tenant.admin_email)
     return tenant
 
 
-def get_tenant_by_id(db: Session, tenant_id: int) -> Tenant:
+async def get_tenant_by_id(db: AsyncSession, tenant_id: int) -> Tenant:
     """Get a tenant by ID."""
-    return db.query(Tenant).filter(Tenant.id == tenant_id).first()
+    result = await db.execute(select(Tenant).where(Tenant.id == tenant_id))
+    return result.scalars().first()
 
 
-def get_tenant_by_db_name(db: Session, db_name: str) -> Tenant:
+async def get_tenant_by_db_name(db: AsyncSession, db_name: str) -> Tenant:
     """Get a tenant by database name."""
-    return db.query(Tenant).filter(Tenant.db_name == db_name).first()
+    result = await db.execute(select(Tenant).where(Tenant.db_name == db_name))
+    return result.scalars().first()
 
 
-def list_tenants(db: Session, skip: int = 0, limit: int = 100):
+async def list_tenants(db: AsyncSession, skip: int = 0, limit: int = 100):
     """List all tenants."""
-    return db.query(Tenant).offset(skip).limit(limit).all()
+    result = await db.execute(select(Tenant).offset(skip).limit(limit))
+    return result.scalars().all()
 
 
-def delete_tenant_record(db: Session, tenant_id: int) -> bool:
+async def delete_tenant_record(db: AsyncSession, tenant_id: int) -> bool:
     """
     Delete a tenant record from the super_admin_db.
     
@@ -80,16 +177,20 @@ def delete_tenant_record(db: Session, tenant_id: int) -> bool:
     Returns:
         True if deleted successfully, False if tenant not found
     """
-    tenant = get_tenant_by_id(db, tenant_id)
+    tenant = await get_tenant_by_id(db, tenant_id)
     if not tenant:
         return False
     
-    db.delete(tenant)
-    db.commit()
+    company_name = tenant.company_name
+    admin_email = tenant.admin_email
+    await record_tenant_event(db, tenant, "deleted")
+    await db.delete(tenant)
+    await db.commit()
+    invalidate_tenant(tenant_id, company_name, admin_email)
     return True
 
 
-def toggle_tenant_status(db: Session, tenant_id: int) -> Tenant:
+async def toggle_tenant_status(db: AsyncSession, tenant_id: int) -> Tenant:
     """
     Toggle tenant status between 'active' and 'inactive'.
     
@@ -106,19 +207,21 @@ def toggle_tenant_status(db: Session, tenant_id: int) -> Tenant:
     Raises:
         ValueError: If tenant not found
     """
-    tenant = get_tenant_by_id(db, tenant_id)
+    tenant = await get_tenant_by_id(db, tenant_id)
     if not tenant:
         raise ValueError(f"Tenant with ID {tenant_id} not found")
     
     # Toggle status
     tenant.status = "inactive" if tenant.status == "active" else "active"
+    await record_tenant_event(db, tenant, "status_changed")
     
-    db.commit()
-    db.refresh(tenant)
+    await db.commit()
+    await db.refresh(tenant)
+    invalidate_tenant(tenant.id, tenant.company_name, tenant.admin_email)
     return tenant
 
 
-def update_tenant_status(db: Session, tenant_id: int, status: str) -> Tenant:
+async def update_tenant_status(db: AsyncSession, tenant_id: int, status: str) -> Tenant:
     """
     Update tenant status to a specific value.
     
@@ -136,13 +239,102 @@ def update_tenant_status(db: Session, tenant_id: int, status: str) -> Tenant:
     if status not in ["active", "inactive"]:
         raise ValueError(f"Invalid status: {status}. Must be 'active' or 'inactive'")
     
-    tenant = get_tenant_by_id(db, tenant_id)
+    tenant = await get_tenant_by_id(db, tenant_id)
     if not tenant:
         raise ValueError(f"Tenant with ID {tenant_id} not found")
     
     tenant.status = status
+    await record_tenant_event(db, tenant, "status_changed")
+    
+    await db.commit()
+    await db.refresh(tenant)
+    invalidate_tenant(tenant.id, tenant.company_name, tenant.admin_email)
+    return tenant
+
+
+async def set_provisioning_step(db: AsyncSession, tenant: Tenant, step: str) -> None:
+    """
+    Record the provisioning step a tenant is at and commit.
     
-    db.commit()
-    db.refresh(tenant)
+    Like save_provisioning_timings this is a plain UPDATE (no version bump,
+    no tenant event); the loaded tenant is kept in sync.
+    
+    Args:
+        db: Database session
+        tenant: Tenant being provisioned
+        step: Step about to run (kept if it fails)
+    """
+    await db.execute(
+        update(Tenant)
+        .where(Tenant.id == tenant.id)
+        .values(provisioning_step=step)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    set_committed_value(tenant, "provisioning_step", step)
+
+
+async def save_provisioning_timings(db: AsyncSession, tenant_id: int, timings: dict) -> None:
+    """
+    Store the provisioning duration breakdown on a tenant and commit.
+    
+    Written with a plain UPDATE: timings are not routing data, so the row
+    version (lookup ETags) is not bumped and no tenant event is recorded.
+    
+    Args:
+        db: Database session
+        tenant_id: ID of the provisioned tenant
+        timings: Breakdown from StepRecorder.timings()
+    """
+    await db.execute(
+        update(Tenant)
+        .where(Tenant.id == tenant_id)
+        .values(provisioning_timings=timings)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+async def save_schema_revision(db: AsyncSession, tenant_id: int, revision: str) -> None:
+    """
+    Record the tenant_migrations revision of a tenant database and commit.
+    
+    Written with a plain UPDATE, like save_provisioning_timings: the
+    revision is not routing data, so the row version is not bumped.
+    
+    Args:
+        db: Database session
+        tenant_id: ID of the tenant
+        revision: Revision(s) in the tenant's alembic_version, comma-separated
+            (None if the database has no alembic_version)
+    """
+    await db.execute(
+        update(Tenant)
+        .where(Tenant.id == tenant_id)
+        .values(schema_revision=revision, schema_checked_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+async def mark_tenant_status(db: AsyncSession, tenant: Tenant, status: str) -> Tenant:
+    """
+    Set the status of an already loaded tenant and commit it.
+    
+    Used by provisioning to record failures ('failed', 'schema_failed',
+    'seed_failed'); unlike update_tenant_status any value is accepted.
+    
+    Args:
+        db: Database session
+        tenant: Tenant instance to update
+        status: New status value
+        
+    Returns:
+        Updated Tenant instance
+    """
+    tenant.status = status
+    await record_tenant_event(db, tenant, "status_changed")
+    await db.commit()
+    invalidate_tenant(tenant.id, tenant.company_name, tenant.admin_email)
     return tenant
 
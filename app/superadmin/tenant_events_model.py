@@ -0,0 +1,42 @@
+"""Model for the tenant change log."""
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime
+from datetime import datetime
+from app.superadmin.models import SuperAdminBase
+
+
+class TenantEvent(SuperAdminBase):
+    """
+    Append-only log of tenant changes (created, status changes, deleted)
+    and of tenant user registrations (user_registered, with user_email).
+    
+    The id is a monotonically increasing sequence number that subscribers
+    use to resume the change feed. tenant_id has no foreign key so events
+    of deleted tenants are kept.
+    """
+    
+    __tablename__ = "tenant_events"
+    
+    id = Column(BigInteger, primary_key=True)
+    tenant_id = Column(Integer, nullable=False, index=True)
+    event_type = Column(String, nullable=False)
+    status = Column(String, nullable=True)
+    company_name = Column(String, nullable=True)
+    admin_email = Column(String, nullable=True)
+    user_email = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    
+    def to_dict(self) -> dict:
+        """Serializable form used for NOTIFY payloads and the event stream."""
+        return {
+            "seq": self.id,
+            "tenant_id": self.tenant_id,
+            "event": self.event_type,
+            "status": self.status,
+            "company_name": self.company_name,
+            "admin_email": self.admin_email,
+            "user_email": self.user_email,
+            "created_at": self.created_at.isoformat() if self.created_at else None
+        }
+    
+    def __repr__(self):
+        return f"<TenantEvent(id={self.id}, tenant_id={self.tenant_id}, event_type='{self.event_type}')>"
@@ -1,5 +1,5 @@
 """Model for tenant user email mappings."""
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint, Index, func
 from datetime import datetime
 from app.superadmin.models import SuperAdminBase
 
@@ -22,6 +22,8 @@ class TenantUser(SuperAdminBase):
     # Ensure email is unique across all tenants
     __table_args__ = (
         UniqueConstraint('email', name='uq_tenant_user_email'),
+        # Case-insensitive login lookups (see app.tenants.service)
+        Index('ix_tenant_users_email_lower', func.lower(email)),
     )
     
     def __repr__(self):
@@ -0,0 +1,215 @@
+"""In-process cache for tenant resolution lookups.
+
+HRMS logins resolve the tenant by company name on every request. The
+cache keeps the result of that lookup (and of the id / email lookups) in
+memory for a short time so repeated logins do not hit super_admin_db.
+Keys are (key_type, value) tuples, e.g. ("company", "acme corp").
+
+Entries are invalidated synchronously by the super admin service whenever
+a tenant is created, changes status or is deleted. The cache is local to
+the process; other uvicorn workers drop their entries when the matching
+tenant event reaches them over LISTEN/NOTIFY (see app.tenants.events), and
+TENANT_CACHE_TTL_SECONDS bounds staleness if the listener is down.
+
+Lookups that found nothing are remembered in negative_cache for a few
+seconds (TENANT_NEGATIVE_CACHE_TTL_SECONDS), so repeated unknown names do
+not query the database every time. The same invalidation drops them when
+a tenant is created or reactivated under that name, email or id.
+"""
+from collections import OrderedDict
+from threading import Lock
+import time
+
+from app.config import settings
+
+
+def normalize_key(value: str) -> str:
+    """Normalize a lookup key (company name or email) for cache/DB lookups."""
+    return value.lower()
+
+
+class TenantCache:
+    """
+    Bounded TTL + LRU cache mapping lookup keys to tenant snapshots.
+
+    Every entry remembers the tenant_id it belongs to, so all keys of a
+    tenant can be dropped at once when that tenant changes.
+
+    Invalidations bump a generation counter. A reader that queried the
+    database passes the generation it saw before the query to set(), so a
+    result that raced with a write is not put back into the cache.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (expires_at, tenant_id, value)
+        self._keys_by_tenant = {}  # tenant_id -> set of keys
+        self._lock = Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, tenant_id, value = entry
+            if expires_at <= now:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, tenant_id, value, generation: int = None) -> None:
+        """
+        Store value under key, evicting the least recently used entry if full.
+
+        If generation is given and an invalidation happened since it was
+        read, the value may be stale and is not stored.
+        """
+        if self.max_size <= 0:
+            return
+
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (expires_at, tenant_id, value)
+            self._keys_by_tenant.setdefault(tenant_id, set()).add(key)
+
+            while len(self._entries) > self.max_size:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def invalidate(self, key) -> None:
+        """Drop a single key."""
+        with self._lock:
+            self.generation += 1
+            if key in self._entries:
+                self._remove(key)
+                self.invalidations += 1
+
+    def invalidate_tenant(self, tenant_id) -> None:
+        """Drop every key that resolves to the given tenant."""
+        with self._lock:
+            self.generation += 1
+            for key in list(self._keys_by_tenant.get(tenant_id, ())):
+                self._remove(key)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._keys_by_tenant.clear()
+
+    def stats(self) -> dict:
+        """Return cache counters for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations
+            }
+
+    def _remove(self, key) -> None:
+        """Remove key from both indexes. Caller must hold the lock."""
+        _, tenant_id, _ = self._entries.pop(key)
+        keys = self._keys_by_tenant.get(tenant_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_tenant[tenant_id]
+
+
+# Shared cache for tenant resolution (company name, admin email, id)
+tenant_cache = TenantCache(
+    max_size=settings.TENANT_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TENANT_CACHE_TTL_SECONDS
+)
+
+# Lookup keys that did not resolve to a tenant (value True, tenant_id None)
+negative_cache = TenantCache(
+    max_size=settings.TENANT_NEGATIVE_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TENANT_NEGATIVE_CACHE_TTL_SECONDS
+)
+
+
+def tenant_snapshot(tenant) -> dict:
+    """
+    Copy the routing fields of a Tenant ORM object into a plain dict.
+
+    The snapshot is detached from the session that loaded it, so it is safe
+    to keep in the cache and share across requests.
+    """
+    return {
+        "id": tenant.id,
+        "name": tenant.name,
+        "company_name": tenant.company_name,
+        "db_name": tenant.db_name,
+        "db_host": tenant.db_host,
+        "db_port": tenant.db_port,
+        "db_user": tenant.db_user,
+        "db_password": tenant.db_password,
+        "admin_email": tenant.admin_email,
+        "status": tenant.status,
+        "version": tenant.version
+    }
+
+
+def invalidate_tenant(tenant_id: int, company_name: str = None, admin_email: str = None) -> None:
+    """
+    Invalidate cached lookups for a tenant after it was written.
+
+    Also drops the negative entries for the tenant's id, company name and
+    admin email, which may resolve now.
+
+    Args:
+        tenant_id: ID of the tenant that changed
+        company_name: Company name of the tenant, if known
+        admin_email: Admin email of the tenant, if known
+    """
+    tenant_cache.invalidate_tenant(tenant_id)
+    negative_cache.invalidate(("id", tenant_id))
+    if company_name:
+        tenant_cache.invalidate(("company", normalize_key(company_name)))
+        negative_cache.invalidate(("company", normalize_key(company_name)))
+    if admin_email:
+        negative_cache.invalidate(("email", normalize_key(admin_email)))
+
+
+def invalidate_email(email: str) -> None:
+    """
+    Invalidate cached lookups for an email after its tenant_users mapping changed.
+
+    Args:
+        email: User email that was registered or moved to another tenant
+    """
+    tenant_cache.invalidate(("email", normalize_key(email)))
+    negative_cache.invalidate(("email", normalize_key(email)))
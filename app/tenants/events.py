@@ -0,0 +1,220 @@
+"""Tenant change feed.
+
+Tenant changes are appended to tenant_events and published with
+NOTIFY by the super admin service (see record_tenant_event). Each worker
+keeps one LISTEN connection to super_admin_db. Notifications invalidate
+the local tenant cache, so every worker drops stale lookups right away
+rather than after their TTL, and are fanned out to the subscribers of the
+/tenants/events/stream endpoint.
+"""
+from sqlalchemy import select, func
+from sqlalchemy.engine import make_url
+from app.config import settings
+from app.superadmin.tenant_events_model import TenantEvent
+from app.database import AsyncSessionLocal, mark_primary_write
+from app.tenants.cache import invalidate_tenant, invalidate_email
+from datetime import datetime
+import asyncio
+import asyncpg
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Events loaded per query when replaying missed events to a subscriber
+EVENT_REPLAY_BATCH = 1000
+
+
+def _listener_dsn() -> str:
+    """Plain libpq DSN for asyncpg, derived from POSTGRES_SUPER_ADMIN_URL."""
+    url = make_url(settings.POSTGRES_SUPER_ADMIN_URL).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+class TenantEventBroadcaster:
+    """
+    Holds the LISTEN connection and fans notifications out to subscribers.
+
+    Each subscriber gets a bounded asyncio.Queue. A subscriber that falls
+    behind is sent None and dropped; it is expected to reconnect and
+    resume from the last sequence number it saw.
+
+    NOTIFYs sent while the LISTEN connection is down are lost. When it
+    drops, every subscriber is closed the same way (so it resumes with
+    Last-Event-ID from tenant_events), and after reconnecting the events
+    persisted since last_seq are replayed through publish(), so the local
+    caches catch up.
+    """
+
+    def __init__(self, channel: str, queue_size: int, reconnect_delay: float = 5.0):
+        self.channel = channel
+        self.queue_size = queue_size
+        self.reconnect_delay = reconnect_delay
+        self._subscribers = set()
+        self._task = None
+        self.connected = False
+        self.last_seq = 0
+        self.disconnects = 0
+        self.disconnected_at = None
+        self.last_gap_seconds = None
+        self.replayed = 0
+
+    async def start(self) -> None:
+        """Start the background LISTEN loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop listening and disconnect all subscribers."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        for queue in list(self._subscribers):
+            self._close_subscriber(queue)
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a subscriber and return its event queue."""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Remove a subscriber."""
+        self._subscribers.discard(queue)
+
+    def stats(self) -> dict:
+        """Return listener state for monitoring."""
+        return {
+            "channel": self.channel,
+            "connected": self.connected,
+            "subscribers": len(self._subscribers),
+            "last_seq": self.last_seq,
+            "disconnects": self.disconnects,
+            "disconnected_since": self.disconnected_at if not self.connected else None,
+            "last_gap_seconds": self.last_gap_seconds,
+            "replayed_events": self.replayed
+        }
+
+    def publish(self, event: dict) -> None:
+        """Apply an event locally and hand it to every subscriber."""
+        self.last_seq = max(self.last_seq, event.get("seq") or 0)
+        # The replica may not have the change yet; read from the primary for a while
+        mark_primary_write()
+        if event.get("event") == "user_registered":
+            invalidate_email(event["user_email"])
+        else:
+            invalidate_tenant(event["tenant_id"], event.get("company_name"), event.get("admin_email"))
+
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.warning("Tenant event subscriber fell behind, disconnecting it")
+                self._close_subscriber(queue)
+
+    def _close_subscriber(self, queue: asyncio.Queue) -> None:
+        """Drop a subscriber and wake it up with the end-of-stream marker."""
+        self._subscribers.discard(queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.error(f"Ignoring malformed tenant event payload: {payload[:200]}")
+            return
+        self.publish(event)
+
+    async def _catch_up(self) -> None:
+        """Publish the events persisted after last_seq (missed while not listening)."""
+        if self.disconnected_at is None:
+            # First connection: nothing was cached before, start from the newest event
+            async with AsyncSessionLocal() as db:
+                self.last_seq = max(self.last_seq, await db.scalar(select(func.max(TenantEvent.id))) or 0)
+            return
+
+        replayed = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                events = await load_events_since(db, self.last_seq, limit=EVENT_REPLAY_BATCH)
+            for event in events:
+                self.publish(event)
+            replayed += len(events)
+            if len(events) < EVENT_REPLAY_BATCH:
+                break
+
+        self.replayed += replayed
+        self.last_gap_seconds = round((datetime.utcnow() - self.disconnected_at).total_seconds(), 1)
+        logger.info(f"Replayed {replayed} tenant events missed during a {self.last_gap_seconds}s listener gap")
+
+    async def _run(self) -> None:
+        """Keep a LISTEN connection open, reconnecting after failures."""
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(_listener_dsn())
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                await connection.add_listener(self.channel, self._on_notify)
+                # Listening already, so nothing falls between the replay and live events
+                await self._catch_up()
+                self.connected = True
+                logger.info(f"Listening for tenant events on channel '{self.channel}'")
+                await closed.wait()
+                logger.warning("Tenant event listener connection closed")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Tenant event listener failed: {str(e)}")
+            finally:
+                if self.connected:
+                    # Events may be missed until the listener is back; make the
+                    # subscribers resume from tenant_events instead
+                    self.connected = False
+                    self.disconnects += 1
+                    self.disconnected_at = datetime.utcnow()
+                    for queue in list(self._subscribers):
+                        self._close_subscriber(queue)
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+
+            await asyncio.sleep(self.reconnect_delay)
+
+
+tenant_event_broadcaster = TenantEventBroadcaster(
+    channel=settings.TENANT_EVENTS_CHANNEL,
+    queue_size=settings.TENANT_EVENTS_QUEUE_SIZE
+)
+
+
+async def load_events_since(db, since: int, limit: int = EVENT_REPLAY_BATCH) -> list:
+    """
+    Load persisted events with a sequence number greater than since.
+
+    Args:
+        db: Async database session
+        since: Last sequence number the caller has seen
+        limit: Maximum number of events to return
+
+    Returns:
+        List of event dicts ordered by sequence number
+    """
+    result = await db.execute(
+        select(TenantEvent)
+        .where(TenantEvent.id > since)
+        .order_by(TenantEvent.id)
+        .limit(limit)
+    )
+    return [event.to_dict() for event in result.scalars()]
+
+
+def format_sse(event: dict) -> bytes:
+    """Encode an event as a Server-Sent Events message."""
+    return f"id: {event['seq']}\nevent: {event['event']}\ndata: {json.dumps(event)}\n\n".encode()
@@ -0,0 +1,66 @@
+"""Rate-limited, sampled logging of tenant lookup misses.
+
+Unknown company names and emails (typos, credential-stuffing bots) can
+arrive at a high rate. Instead of one WARNING per miss, misses are counted
+and a random sample of the keys is kept; one summary line is logged per
+TENANT_MISS_LOG_INTERVAL_SECONDS, when the next miss arrives.
+"""
+from threading import Lock
+import logging
+import random
+import time
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SampledMissLog:
+    """
+    Counts lookup misses per key type and logs a periodic sampled summary.
+
+    The sample is a reservoir sample, so every miss of the interval has the
+    same chance of appearing in the log line.
+    """
+
+    def __init__(self, interval_seconds: float, sample_size: int):
+        self.interval_seconds = interval_seconds
+        self.sample_size = sample_size
+        self._lock = Lock()
+        self._started_at = time.monotonic()
+        self._counts = {}
+        self._seen = 0
+        self._sample = []
+
+    def record(self, key_type: str, value) -> None:
+        """Count a miss for (key_type, value) and log a summary if one is due."""
+        now = time.monotonic()
+        with self._lock:
+            self._counts[key_type] = self._counts.get(key_type, 0) + 1
+            self._seen += 1
+            if len(self._sample) < self.sample_size:
+                self._sample.append(f"{key_type}:{value}")
+            else:
+                slot = random.randrange(self._seen)
+                if slot < self.sample_size:
+                    self._sample[slot] = f"{key_type}:{value}"
+
+            elapsed = now - self._started_at
+            if elapsed < self.interval_seconds:
+                return
+
+            counts, sample = self._counts, self._sample
+            self._counts, self._sample, self._seen = {}, [], 0
+            self._started_at = now
+
+        logger.warning(
+            f"Tenant lookup misses in the last {elapsed:.0f}s: "
+            f"{sum(counts.values())} ({', '.join(f'{k}={v}' for k, v in sorted(counts.items()))}); "
+            f"sample: {sample}"
+        )
+
+
+tenant_miss_log = SampledMissLog(
+    interval_seconds=settings.TENANT_MISS_LOG_INTERVAL_SECONDS,
+    sample_size=settings.TENANT_MISS_LOG_SAMPLE_SIZE
+)
@@ -0,0 +1,349 @@
+"""Service layer for tenant resolution lookups."""
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, literal_column, union_all
+from app.superadmin.models import Tenant
+from app.superadmin.tenant_events_model import TenantEvent
+from app.superadmin.tenant_users_model import TenantUser
+from app.tenants.cache import tenant_cache, negative_cache, tenant_snapshot, normalize_key
+from app.tenants.payloads import TenantPayloads
+from app.config import settings
+import asyncio
+
+# Rendered inline (not as a bind parameter) so the planner can match the
+# partial "WHERE status = 'active'" lookup indexes on tenants.
+ACTIVE_STATUS = literal_column("'active'")
+
+# Single-flight: cache key -> (future of the in-flight query's result,
+# cache generations the query started with)
+_in_flight = {}
+_single_flight = {"queries": 0, "coalesced": 0}
+
+
+def _lookup_columns():
+    """Key type -> (column expression to match, only active tenants)."""
+    return {
+        "id": (Tenant.id, False),
+        "company": (func.lower(Tenant.company_name), True)
+    }
+
+
+def _email_query(emails: list):
+    """
+    Active tenants for lowercased emails, from admin emails and tenant_users.
+
+    One round trip: a UNION ALL of both sources (served by
+    ix_tenants_admin_email_lower_active and ix_tenant_users_email_lower)
+    joined back to tenants. Rows come ordered by email with admin matches
+    first, then by tenant id.
+    """
+    admin_email = func.lower(Tenant.admin_email)
+    user_email = func.lower(TenantUser.email)
+    matches = union_all(
+        select(Tenant.id.label("tenant_id"), admin_email.label("email"), literal_column("0").label("source"))
+        .where(admin_email.in_(emails), Tenant.status == ACTIVE_STATUS),
+        select(TenantUser.tenant_id.label("tenant_id"), user_email.label("email"), literal_column("1").label("source"))
+        .where(user_email.in_(emails))
+    ).subquery()
+
+    return (
+        select(Tenant, matches.c.email)
+        .join(matches, Tenant.id == matches.c.tenant_id)
+        .where(Tenant.status == ACTIVE_STATUS)
+        .order_by(matches.c.email, matches.c.source, Tenant.id)
+    )
+
+
+def _cache_key(key_type: str, value):
+    """Build the tenant cache key for a lookup value."""
+    return (key_type, value if key_type == "id" else normalize_key(value))
+
+
+def _match_value(key_type: str, tenant: Tenant):
+    """The lookup value a loaded tenant answers for the given key type."""
+    if key_type == "id":
+        return tenant.id
+    return normalize_key(tenant.company_name)
+
+
+async def _query_matches(db: AsyncSession, key_type: str, values: list) -> list:
+    """Run the lookup query for one key type; returns (match value, Tenant) pairs in priority order."""
+    if key_type == "email":
+        result = await db.execute(_email_query(values))
+        return [(email, tenant) for tenant, email in result.all()]
+
+    column, active_only = _lookup_columns()[key_type]
+    query = select(Tenant).where(column.in_(values)).order_by(Tenant.id)
+    if active_only:
+        query = query.where(Tenant.status == ACTIVE_STATUS)
+
+    result = await db.execute(query)
+    return [(_match_value(key_type, tenant), tenant) for tenant in result.scalars()]
+
+
+async def _resolve_many(db: AsyncSession, key_type: str, values: list) -> dict:
+    """
+    Resolve lookup values of one key type, cache first, then one IN query.
+
+    Values known not to resolve (negative cache) are not queried again
+    until their short TTL expires; values the query does not find are added.
+
+    Concurrent calls for the same key share one query (single-flight): the
+    first caller queries, later callers await its result instead of taking
+    a connection of their own. A query only takes followers while no cache
+    invalidation has happened since it started.
+
+    Args:
+        db: Database session
+        key_type: "id", "company" or "email"
+        values: Lookup values as given by the caller
+
+    Returns:
+        dict mapping each value to its TenantPayloads, or None if not found
+    """
+    generations = (tenant_cache.generation, negative_cache.generation)
+    found = {}
+    missing = {}
+    waiting = {}
+    for value in values:
+        cache_key = _cache_key(key_type, value)
+        cached = tenant_cache.get(cache_key)
+        if cached is not None:
+            found[cache_key] = cached
+        elif negative_cache.get(cache_key) is not None:
+            continue
+        elif cache_key in waiting or cache_key[1] in missing:
+            continue
+        elif cache_key in _in_flight and _in_flight[cache_key][1] == generations:
+            waiting[cache_key] = _in_flight[cache_key][0]
+        else:
+            missing[cache_key[1]] = cache_key
+
+    if missing:
+        await _query_missing(db, key_type, missing, found, generations)
+
+    retry = []
+    for cache_key, future in waiting.items():
+        try:
+            # shield: our own cancellation must not cancel the shared future
+            found[cache_key] = await asyncio.shield(future)
+            _single_flight["coalesced"] += 1
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise
+            # The querying request failed or went away; query ourselves
+            retry.append(cache_key)
+
+    if retry:
+        resolved = await _resolve_many(db, key_type, [cache_key[1] for cache_key in retry])
+        for cache_key in retry:
+            found[cache_key] = resolved[cache_key[1]]
+
+    return {value: found.get(_cache_key(key_type, value)) for value in values}
+
+
+async def _query_missing(db: AsyncSession, key_type: str, missing: dict, found: dict, generations: tuple) -> None:
+    """
+    Query the missing keys as the single-flight leader and publish the results.
+
+    Args:
+        db: Database session
+        key_type: "id", "company" or "email"
+        missing: Normalized lookup value -> cache key, for keys to query
+        found: Cache key -> TenantPayloads, filled in place
+        generations: (tenant_cache, negative_cache) generations read before the query
+    """
+    loop = asyncio.get_running_loop()
+    futures = {cache_key: loop.create_future() for cache_key in missing.values()}
+    for cache_key, future in futures.items():
+        _in_flight[cache_key] = (future, generations)
+    _single_flight["queries"] += 1
+
+    try:
+        generation, negative_generation = generations
+        for match_value, tenant in await _query_matches(db, key_type, list(missing)):
+            cache_key = missing.get(match_value)
+            if cache_key is None or cache_key in found:
+                continue
+
+            # First match wins (lowest id; admin emails before tenant_users)
+            found[cache_key] = TenantPayloads(tenant_snapshot(tenant))
+            tenant_cache.set(cache_key, tenant.id, found[cache_key], generation=generation)
+
+        for cache_key in missing.values():
+            if cache_key not in found:
+                negative_cache.set(cache_key, None, True, generation=negative_generation)
+    except BaseException:
+        # Followers fall back to their own query
+        for future in futures.values():
+            future.cancel()
+        raise
+    finally:
+        for cache_key, future in futures.items():
+            if not future.done():
+                future.set_result(found.get(cache_key))
+            if _in_flight.get(cache_key, (None,))[0] is future:
+                del _in_flight[cache_key]
+
+
+def single_flight_stats() -> dict:
+    """Return single-flight counters (queries run, lookups served by another request's query)."""
+    return {"in_flight": len(_in_flight), **_single_flight}
+
+
+async def find_active_tenant_by_company(db: AsyncSession, company_name: str) -> TenantPayloads:
+    """
+    Resolve an active tenant by company name (case-insensitive).
+
+    Results are served from the in-process tenant cache when possible;
+    only cache misses query super_admin_db. Unknown names are cached
+    briefly in the negative cache.
+
+    Args:
+        db: Database session
+        company_name: Company name to resolve
+
+    Returns:
+        TenantPayloads for the tenant, or None if not found
+    """
+    resolved = await _resolve_many(db, "company", [company_name])
+    return resolved[company_name]
+
+
+async def find_active_tenant_by_email(db: AsyncSession, email: str) -> TenantPayloads:
+    """
+    Resolve an active tenant by email (case-insensitive, cached).
+
+    Matches the tenant's admin email first, then the user emails registered
+    in tenant_users, in a single query.
+
+    Args:
+        db: Database session
+        email: Admin email to resolve
+
+    Returns:
+        TenantPayloads for the tenant, or None if not found
+    """
+    resolved = await _resolve_many(db, "email", [email])
+    return resolved[email]
+
+
+async def get_tenant_payloads(db: AsyncSession, tenant_id: int) -> TenantPayloads:
+    """
+    Resolve a tenant by ID regardless of its status (cached).
+
+    Args:
+        db: Database session
+        tenant_id: Tenant ID to resolve
+
+    Returns:
+        TenantPayloads for the tenant, or None if not found
+    """
+    resolved = await _resolve_many(db, "id", [tenant_id])
+    return resolved[tenant_id]
+
+
+async def resolve_tenants(
+    db: AsyncSession,
+    tenant_ids: list = None,
+    company_names: list = None,
+    emails: list = None
+) -> dict:
+    """
+    Resolve many tenants at once, with at most one query per key type.
+
+    Keys follow the rules of the single-key endpoints: tenant ids resolve
+    regardless of status, company names and emails (admin or registered
+    user) only resolve active tenants and are matched case-insensitively. Keys already in the
+    tenant cache are not queried.
+
+    Args:
+        db: Database session
+        tenant_ids: Tenant IDs to resolve
+        company_names: Company names to resolve
+        emails: Admin or registered user emails to resolve
+
+    Returns:
+        dict with "tenant_ids", "company_names" and "emails" maps from each
+        requested key to its TenantPayloads, or None if it did not resolve
+    """
+    return {
+        "tenant_ids": await _resolve_many(db, "id", list(dict.fromkeys(tenant_ids or []))),
+        "company_names": await _resolve_many(db, "company", list(dict.fromkeys(company_names or []))),
+        "emails": await _resolve_many(db, "email", list(dict.fromkeys(emails or [])))
+    }
+
+
+async def _directory_snapshot(db: AsyncSession, version: int) -> dict:
+    """Full directory: every active tenant, tagged with the given version."""
+    result = await db.execute(
+        select(Tenant).where(Tenant.status == ACTIVE_STATUS).order_by(Tenant.id)
+    )
+    return {
+        "version": version,
+        "full": True,
+        "tenants": [TenantPayloads(tenant_snapshot(tenant)).directory_entry for tenant in result.scalars()],
+        "removed": []
+    }
+
+
+async def get_tenant_directory(db: AsyncSession, since: int = None) -> dict:
+    """
+    Return the routing directory of active tenants, in full or as a delta.
+
+    Versions are tenant_events sequence numbers. The high-water mark is
+    read before the tenants, so an entry may already reflect a later event;
+    that event is sent again on the next delta, and applying entries is
+    idempotent.
+
+    Args:
+        db: Database session
+        since: Version the caller already holds, or None for a full snapshot
+
+    Returns:
+        dict with version, full, tenants (directory entries) and removed
+        (tombstones of deleted or no longer active tenants). A full
+        snapshot is returned when since is unknown to this database or too
+        many events happened since (TENANT_DIRECTORY_MAX_DELTA_EVENTS).
+    """
+    high_water = (await db.execute(select(func.coalesce(func.max(TenantEvent.id), 0)))).scalar()
+    if since is None or since > high_water or since < 0:
+        return await _directory_snapshot(db, high_water)
+
+    max_events = settings.TENANT_DIRECTORY_MAX_DELTA_EVENTS
+    result = await db.execute(
+        select(TenantEvent.id, TenantEvent.tenant_id, TenantEvent.event_type)
+        .where(TenantEvent.id > since, TenantEvent.id <= high_water)
+        .order_by(TenantEvent.id)
+        .limit(max_events + 1)
+    )
+    events = result.all()
+    if len(events) > max_events:
+        return await _directory_snapshot(db, high_water)
+
+    # Only the latest event per tenant matters
+    last_event = {}
+    for _, tenant_id, event_type in events:
+        last_event[tenant_id] = event_type
+
+    tenants = {}
+    if last_event:
+        result = await db.execute(select(Tenant).where(Tenant.id.in_(list(last_event))))
+        tenants = {tenant.id: tenant for tenant in result.scalars()}
+
+    entries = []
+    removed = []
+    for tenant_id, event_type in sorted(last_event.items()):
+        tenant = tenants.get(tenant_id)
+        if event_type == "deleted" or tenant is None:
+            removed.append({"tenant_id": tenant_id, "status": "deleted"})
+        elif tenant.status != "active":
+            removed.append({"tenant_id": tenant_id, "status": tenant.status})
+        else:
+            entries.append(TenantPayloads(tenant_snapshot(tenant)).directory_entry)
+
+    return {
+        "version": high_water,
+        "full": False,
+        "tenants": entries,
+        "removed": removed
+    }
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Compare tenant database provisioning from DDL with cloning the schema template.
+
+For each iteration this creates one database the old way (CREATE DATABASE
+followed by the full schema DDL) and one from the template (CREATE
+DATABASE ... TEMPLATE followed by the per-tenant settings), times both and
+drops them again. No tenant records are written.
+
+Usage:
+    python scripts/benchmark_provisioning.py [iterations]
+"""
+
+import sys
+import os
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app.database import server_engine, tenant_engines
+from app.hrms_provisioning.database_creator import create_database
+from app.hrms_provisioning.template_db import ensure_template, create_database_from_template, apply_tenant_settings
+from app.superadmin.create_perfect_schema import create_perfect_tenant_schema
+import logging
+import math
+import statistics
+import time
+import uuid
+
+logging.basicConfig(level=logging.WARNING, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+# Tenant id used for the per-tenant UPDATE (no tenant record is needed)
+BENCHMARK_TENANT_ID = 0
+
+
+def provision_with_ddl(db_name: str) -> None:
+    create_database(db_name)
+    result = create_perfect_tenant_schema(db_name, BENCHMARK_TENANT_ID)
+    if result["status"] != "success":
+        raise RuntimeError(result["message"])
+
+
+def provision_from_template(db_name: str) -> None:
+    create_database_from_template(db_name)
+    result = apply_tenant_settings(db_name, BENCHMARK_TENANT_ID)
+    if result["status"] != "success":
+        raise RuntimeError(result["message"])
+
+
+def drop_database(db_name: str) -> None:
+    tenant_engines.dispose(db_name)
+    with server_engine.connect() as connection:
+        connection.execute(text(f'DROP DATABASE IF EXISTS "{db_name}"'))
+
+
+def summarize(label: str, timings: list) -> None:
+    ordered = sorted(timings)
+    p95 = ordered[max(math.ceil(0.95 * len(ordered)) - 1, 0)]
+    print(
+        f"{label:<10} mean {statistics.mean(ordered) * 1000:8.1f} ms"
+        f"   median {statistics.median(ordered) * 1000:8.1f} ms"
+        f"   p95 {p95 * 1000:8.1f} ms"
+    )
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    # Build the template up front; its one-time cost is not what we measure
+    ensure_template()
+
+    timings = {"ddl": [], "template": []}
+    for i in range(iterations):
+        for label, provision in (("ddl", provision_with_ddl), ("template", provision_from_template)):
+            db_name = f"bench_{label}_{uuid.uuid4().hex[:8]}"
+            started = time.perf_counter()
+            try:
+                provision(db_name)
+                timings[label].append(time.perf_counter() - started)
+            finally:
+                drop_database(db_name)
+        print(f"Iteration {i + 1}/{iterations} done")
+
+    print()
+    print("=" * 70)
+    print(f"PROVISIONING BENCHMARK ({iterations} iterations)")
+    print("=" * 70)
+    summarize("DDL", timings["ddl"])
+    summarize("Template", timings["template"])
+    speedup = statistics.median(timings["ddl"]) / statistics.median(timings["template"])
+    print(f"Template provisioning is {speedup:.1f}x faster (median)")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n❌ Operation cancelled by user.")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"Fatal error: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
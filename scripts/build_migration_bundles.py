@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Pre-render the tenant migration SQL bundles.
+
+Renders the upgrade from every earlier revision (and from an empty
+database) to the tenant_migrations head(s) in Alembic's offline mode and
+stores each in TENANT_MIGRATION_BUNDLE_DIR, keyed by a checksum of the
+revision range (see app/hrms_provisioning/migration_bundles.py). Run it at
+build or deploy time so no worker renders bundles while migrating tenants.
+
+Usage:
+    python scripts/build_migration_bundles.py [target]    (default: heads)
+"""
+
+import sys
+import os
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.hrms_provisioning.migration_bundles import build_bundles, bundle_dir
+import logging
+
+logging.basicConfig(level=logging.WARNING, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main():
+    target = sys.argv[1] if len(sys.argv) > 1 else "heads"
+    built = build_bundles(target)
+
+    print()
+    print("=" * 70)
+    print("TENANT MIGRATION BUNDLES")
+    print("=" * 70)
+    print(f"Directory: {bundle_dir()}")
+    for bundle in built:
+        print(f"{bundle['start'] or 'base'} -> {bundle['target']}: {bundle['checksum'][:16]}")
+    print(f"✅ {len(built)} bundles ready")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n❌ Operation cancelled by user.")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"Fatal error: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
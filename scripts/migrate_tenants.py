@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Upgrade every tenant database to a tenant_migrations revision.
+
+Same fleet migration as POST /super-admin/jobs/migrate-tenants (see
+app/hrms_provisioning/fleet_migrations.py), run in the foreground with
+progress printed per tenant.
+
+Usage:
+    python scripts/migrate_tenants.py [--target head] [--concurrency 4] [--continue-on-failure]
+"""
+
+import sys
+import os
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.hrms_provisioning.fleet_migrations import migrate_tenant_fleet
+import argparse
+import asyncio
+import logging
+
+logging.basicConfig(level=logging.WARNING, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+
+async def print_progress(progress: dict) -> None:
+    done = progress["checked"] + progress["skipped"]
+    print(
+        f"[{done}/{progress['total']}] upgraded {progress['upgraded']}, "
+        f"up to date {progress['up_to_date']}, unversioned {progress['unversioned']}, "
+        f"failed {progress['failed']}, skipped {progress['skipped']}"
+    )
+
+
+async def main(args) -> int:
+    summary = await migrate_tenant_fleet(
+        target=args.target,
+        concurrency=args.concurrency,
+        on_failure="continue" if args.continue_on_failure else "stop",
+        on_progress=print_progress
+    )
+
+    print()
+    print("=" * 70)
+    print("TENANT MIGRATION")
+    print("=" * 70)
+    print(f"Target:      {summary['target']} ({', '.join(summary['target_revisions'])})")
+    print(f"Tenants:     {summary['total']}")
+    print(f"Upgraded:    {summary['upgraded']}")
+    print(f"Up to date:  {summary['up_to_date']}")
+    print(f"Unversioned: {summary['unversioned']}")
+    print(f"Failed:      {summary['failed']}")
+    print(f"Skipped:     {summary['skipped']}")
+    print(f"Duration:    {summary['duration_ms']} ms")
+
+    for outcome in summary["tenants"]:
+        if outcome["status"] == "failed":
+            print(f"❌ {outcome['db_name']} (tenant {outcome['tenant_id']}): {outcome['error']}")
+
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Upgrade every tenant database to a tenant_migrations revision")
+    parser.add_argument("--target", default="head", help="Revision to upgrade to (default: head)")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.TENANT_MIGRATION_CONCURRENCY,
+        help="Tenant databases migrated at the same time"
+    )
+    parser.add_argument(
+        "--continue-on-failure",
+        action="store_true",
+        help="Attempt every tenant instead of stopping at the first failure"
+    )
+
+    try:
+        sys.exit(asyncio.run(main(parser.parse_args())))
+    except KeyboardInterrupt:
+        print("\n❌ Operation cancelled by user.")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"Fatal error: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Rebuild the tenant schema template database.
+
+New tenant databases are cloned from hrms_template_<schema version>
+(see app/hrms_provisioning/template_db.py). The template is rebuilt
+automatically when the schema definition changes; run this script to
+force a rebuild, e.g. after changing PostgreSQL extensions or collations.
+"""
+
+import sys
+import os
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.hrms_provisioning.template_db import ensure_template, template_status
+import logging
+
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main():
+    template_name = ensure_template(rebuild=True)
+    status = template_status()
+
+    print()
+    print("=" * 70)
+    print("TENANT TEMPLATE")
+    print("=" * 70)
+    print(f"Template database: {template_name}")
+    print(f"Schema version:    {status['schema_version']}")
+    print(f"Ready:             {'✅ yes' if status['exists'] else '❌ no'}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n❌ Operation cancelled by user.")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"Fatal error: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -1,6 +1,8 @@
 """Alembic environment configuration for tenant migrations.
 
-This env.py reads the database URL from the DATABASE_URL environment variable.
+This env.py reads the database URL from the DATABASE_URL environment variable,
+or uses the connection passed in config.attributes["connection"] when run
+in-process (see app/hrms_provisioning/run_migrations.py).
 It does NOT import any HRMS backend code.
 """
 from logging.config import fileConfig
@@ -16,19 +18,27 @@ config = context.config
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-if config.config_file_name is not None:
+# In-process runs keep the service's logging configuration.
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
     fileConfig(config.config_file_name)
 
+# Connection supplied by an in-process caller (the caller owns its transaction)
+supplied_connection = config.attributes.get("connection")
+
+# URL set by an in-process caller rendering offline SQL (names the dialect only)
+preset_url = config.get_main_option('sqlalchemy.url')
+
 # Get database URL from environment variable
 database_url = os.environ.get('DATABASE_URL')
-if not database_url:
+if supplied_connection is None and not database_url and not preset_url:
     raise ValueError(
         "DATABASE_URL environment variable is required to run tenant migrations. "
         "This should be set by the Super Admin service before running migrations."
     )
 
 # Override the sqlalchemy.url in the config
-config.set_main_option('sqlalchemy.url', database_url)
+if database_url and not preset_url:
+    config.set_main_option('sqlalchemy.url', database_url)
 
 # For 'autogenerate' support, you would need to import your models' MetaData
 # Since we're decoupling from HRMS, we'll define the target metadata here
@@ -66,6 +76,15 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    if supplied_connection is not None:
+        context.configure(
+            connection=supplied_connection, target_metadata=target_metadata
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section),
         prefix="sqlalchemy.",